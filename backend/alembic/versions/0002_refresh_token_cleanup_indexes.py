@@ -0,0 +1,31 @@
+"""refresh token cleanup indexes
+
+Revision ID: 0002_refresh_token_cleanup_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_refresh_token_cleanup_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_refresh_tokens_expires_at_id", "refresh_tokens", ["expires_at", "id"])
+    op.create_index(
+        "ix_refresh_tokens_revoked_at_id",
+        "refresh_tokens",
+        ["revoked_at", "id"],
+        postgresql_where=sa.text("revoked_at IS NOT NULL"),
+        sqlite_where=sa.text("revoked_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_revoked_at_id", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_expires_at_id", table_name="refresh_tokens")
@@ -0,0 +1,25 @@
+"""users agency keyset index
+
+Revision ID: 0003_users_agency_keyset_index
+Revises: 0002_refresh_token_cleanup_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_users_agency_keyset_index"
+down_revision = "0002_refresh_token_cleanup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_agency_id_id", "users", ["agency_id", "id"])
+    op.drop_index("ix_users_agency_id", table_name="users")
+
+
+def downgrade() -> None:
+    op.create_index("ix_users_agency_id", "users", ["agency_id"])
+    op.drop_index("ix_users_agency_id_id", table_name="users")
@@ -0,0 +1,113 @@
+"""audit log composite indexes and monthly partitioning
+
+Revision ID: 0004_audit_log_partitioning
+Revises: 0003_users_agency_keyset_index
+Create Date: 2026-10-18 00:00:00.000000
+
+On PostgreSQL audit_logs becomes a table partitioned by month on
+created_at (primary key (id, created_at)), with a default partition so no
+insert is ever rejected. Other dialects only get the composite indexes.
+"""
+from datetime import datetime, timezone
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.db.partitions import create_audit_partitions, month_start
+
+
+revision = "0004_audit_log_partitioning"
+down_revision = "0003_users_agency_keyset_index"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 12
+
+COLUMNS = """
+    agency_id INTEGER REFERENCES agencies(id),
+    actor_user_id INTEGER REFERENCES users(id),
+    event_type VARCHAR(100) NOT NULL,
+    resource_type VARCHAR(100),
+    resource_id VARCHAR(100),
+    message TEXT,
+    ip_address VARCHAR(45),
+    user_agent VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+"""
+COLUMN_NAMES = (
+    "id, agency_id, actor_user_id, event_type, resource_type, resource_id, "
+    "message, ip_address, user_agent, created_at"
+)
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_audit_logs_agency_created", "audit_logs", ["agency_id", "created_at", "id"])
+    op.create_index("ix_audit_logs_agency_actor_created", "audit_logs", ["agency_id", "actor_user_id", "created_at"])
+    op.create_index(
+        "ix_audit_logs_agency_resource_created",
+        "audit_logs",
+        ["agency_id", "resource_type", "resource_id", "created_at"],
+    )
+
+
+def upgrade() -> None:
+    op.drop_index("ix_audit_logs_actor_user_id", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_agency_id", table_name="audit_logs")
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        _create_indexes()
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+    op.execute(
+        f"""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            {COLUMNS},
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    oldest = None
+    if not context.is_offline_mode():
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    current = month_start(datetime.now(timezone.utc).date())
+    first = month_start(oldest.date()) if oldest else current
+    months = (current.year - first.year) * 12 + current.month - first.month + 1 + MONTHS_AHEAD
+    create_audit_partitions(bind, first, months, has_default=False)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    op.execute(f"INSERT INTO audit_logs ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+    _create_indexes()
+    op.create_index("ix_audit_logs_created_at_brin", "audit_logs", ["created_at"], postgresql_using="brin")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+        op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+        op.execute(
+            f"""
+            CREATE TABLE audit_logs (
+                id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq') PRIMARY KEY,
+                {COLUMNS}
+            )
+            """
+        )
+        op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+        op.execute(f"INSERT INTO audit_logs ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM audit_logs_partitioned")
+        op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    else:
+        op.drop_index("ix_audit_logs_agency_resource_created", table_name="audit_logs")
+        op.drop_index("ix_audit_logs_agency_actor_created", table_name="audit_logs")
+        op.drop_index("ix_audit_logs_agency_created", table_name="audit_logs")
+
+    op.create_index("ix_audit_logs_agency_id", "audit_logs", ["agency_id"])
+    op.create_index("ix_audit_logs_actor_user_id", "audit_logs", ["actor_user_id"])
@@ -0,0 +1,57 @@
+"""role permissions and unique user role assignments
+
+Revision ID: 0005_role_permissions
+Revises: 0004_audit_log_partitioning
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_role_permissions"
+down_revision = "0004_audit_log_partitioning"
+branch_labels = None
+depends_on = None
+
+PERMISSIONS = ("phi:read", "users:read", "users:write", "roles:read", "roles:assign", "audit:read", "audit:export")
+DEFAULT_ROLE_PERMISSIONS = {"admin": PERMISSIONS, "clinician": ("phi:read",)}
+
+
+def upgrade() -> None:
+    permissions = op.create_table(
+        "permissions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False, unique=True),
+    )
+    op.create_table(
+        "role_permissions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id"), nullable=False),
+        sa.Column("permission_id", sa.Integer(), sa.ForeignKey("permissions.id"), nullable=False),
+        sa.UniqueConstraint("role_id", "permission_id", name="uq_role_permissions_role_permission"),
+    )
+    op.bulk_insert(permissions, [{"name": name} for name in PERMISSIONS])
+    for role_name, names in DEFAULT_ROLE_PERMISSIONS.items():
+        quoted = ", ".join(f"'{name}'" for name in names)
+        op.execute(
+            "INSERT INTO role_permissions (role_id, permission_id) "
+            "SELECT roles.id, permissions.id FROM roles, permissions "
+            f"WHERE roles.name = '{role_name}' AND permissions.name IN ({quoted})"
+        )
+
+    op.execute(
+        "DELETE FROM user_roles WHERE id NOT IN "
+        "(SELECT min(id) FROM user_roles GROUP BY user_id, role_id)"
+    )
+    with op.batch_alter_table("user_roles") as batch_op:
+        batch_op.create_unique_constraint("uq_user_roles_user_role", ["user_id", "role_id"])
+    op.drop_index("ix_user_roles_user_id", table_name="user_roles")
+
+
+def downgrade() -> None:
+    op.create_index("ix_user_roles_user_id", "user_roles", ["user_id"])
+    with op.batch_alter_table("user_roles") as batch_op:
+        batch_op.drop_constraint("uq_user_roles_user_role", type_="unique")
+    op.drop_table("role_permissions")
+    op.drop_table("permissions")
@@ -0,0 +1,47 @@
+"""tenant composite indexes and row-level security policies
+
+Revision ID: 0006_tenant_scoping
+Revises: 0005_role_permissions
+Create Date: 2026-10-18 00:00:00.000000
+
+On PostgreSQL, users and audit_logs get row-level security policies keyed on
+the app.agency_id setting. Sessions that do not set it (migrations,
+maintenance jobs, login) see every row, and the table owner bypasses the
+policies unless they are forced, so isolation applies once the app
+connects as a non-owner role with TENANT_RLS enabled.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_tenant_scoping"
+down_revision = "0005_role_permissions"
+branch_labels = None
+depends_on = None
+
+RLS_TABLES = ("users", "audit_logs")
+POLICY = (
+    "coalesce(current_setting('app.agency_id', true), '') = '' "
+    "OR agency_id = current_setting('app.agency_id', true)::integer"
+)
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_agency_active_id", "users", ["agency_id", "is_active", "id"])
+    op.create_index("ix_users_agency_email", "users", ["agency_id", "email"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in RLS_TABLES:
+        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+        op.execute(f"CREATE POLICY {table}_agency_isolation ON {table} USING ({POLICY}) WITH CHECK ({POLICY})")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table in RLS_TABLES:
+            op.execute(f"DROP POLICY {table}_agency_isolation ON {table}")
+            op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+
+    op.drop_index("ix_users_agency_email", table_name="users")
+    op.drop_index("ix_users_agency_active_id", table_name="users")
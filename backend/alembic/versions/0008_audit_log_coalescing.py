@@ -0,0 +1,28 @@
+"""coalesced audit log records
+
+Revision ID: 0008_audit_log_coalescing
+Revises: 0007_revoked_tokens
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_audit_log_coalescing"
+down_revision = "0007_revoked_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_logs", sa.Column("first_seen", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("audit_logs", sa.Column("last_seen", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("audit_logs", sa.Column("event_count", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("audit_logs") as batch_op:
+        batch_op.drop_column("event_count")
+        batch_op.drop_column("last_seen")
+        batch_op.drop_column("first_seen")
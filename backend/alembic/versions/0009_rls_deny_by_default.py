@@ -0,0 +1,45 @@
+"""tenant row-level security denies sessions without an agency
+
+Revision ID: 0009_rls_deny_by_default
+Revises: 0008_audit_log_coalescing
+Create Date: 2026-10-18 00:00:00.000000
+
+The 0006 policies let any session that had not set app.agency_id see every
+agency's rows, so a request that missed scope_to_agency was not caught.
+Now such a session sees and writes nothing; work that must span agencies
+(login, principal lookup, audit and token background jobs, seeding) sets
+app.bypass_rls = 'on' explicitly. Roles with BYPASSRLS, including
+superusers, are unaffected.
+"""
+from alembic import op
+
+
+revision = "0009_rls_deny_by_default"
+down_revision = "0008_audit_log_coalescing"
+branch_labels = None
+depends_on = None
+
+RLS_TABLES = ("users", "audit_logs")
+POLICY = (
+    "coalesce(current_setting('app.bypass_rls', true), '') = 'on' "
+    "OR agency_id = nullif(current_setting('app.agency_id', true), '')::integer"
+)
+PREVIOUS_POLICY = (
+    "coalesce(current_setting('app.agency_id', true), '') = '' "
+    "OR agency_id = current_setting('app.agency_id', true)::integer"
+)
+
+
+def _alter_policies(policy: str) -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in RLS_TABLES:
+        op.execute(f"ALTER POLICY {table}_agency_isolation ON {table} USING ({policy}) WITH CHECK ({policy})")
+
+
+def upgrade() -> None:
+    _alter_policies(POLICY)
+
+
+def downgrade() -> None:
+    _alter_policies(PREVIOUS_POLICY)
@@ -0,0 +1,143 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_request_metadata, query_budget, require_permission
+from app.api.responses import TrustedJSONResponse, records
+from app.db.session import SessionLocal, run_db
+from app.db.tenancy import agency_sessions
+from app.models.audit_log import AuditLog
+from app.schemas.audit import AuditLogPage, AuditLogRead
+from app.services.audit import log_event
+from app.services.audit_export import MEDIA_TYPES, iter_audit_export
+from app.services.audit_query import audit_filters, decode_cursor, encode_cursor
+from app.services.principal_cache import Principal
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+AUDIT_LOG_COLUMNS = tuple(getattr(AuditLog, name) for name in AuditLogRead.model_fields)
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _query_audit_logs(db: Session, filters: list, *, limit: int, cursor: str | None) -> dict:
+    query = select(*AUDIT_LOG_COLUMNS).where(*filters)
+    if cursor is not None:
+        query = query.where(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(*_decode_cursor(cursor)))
+    rows = db.execute(query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1)).all()
+
+    page = {"items": records(rows[:limit]), "next_cursor": None}
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        page["next_cursor"] = encode_cursor(last.created_at, last.id)
+    return page
+
+
+@router.get(
+    "",
+    response_model=AuditLogPage,
+    response_class=TrustedJSONResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def list_audit_logs(
+    request: Request,
+    event_type: str | None = None,
+    actor_user_id: int | None = None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    start: datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    end: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("audit:read")),
+) -> TrustedJSONResponse:
+    filters = audit_filters(
+        current_user.agency_id,
+        event_type=event_type,
+        actor_user_id=actor_user_id,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        start=start,
+        end=end,
+    )
+    page = await run_db(db, _query_audit_logs, filters, limit=limit, cursor=cursor)
+    metadata = get_request_metadata(request)
+    await log_event(
+        db,
+        agency_id=current_user.agency_id,
+        actor_user_id=current_user.id,
+        event_type="audit_read",
+        resource_type="audit_log",
+        message="Admin queried audit log",
+        **metadata,
+    )
+    return TrustedJSONResponse(page)
+
+
+@router.get("/export", dependencies=[Depends(query_budget(2))])
+async def export_audit_logs(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    event_type: str | None = None,
+    actor_user_id: int | None = None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    start: datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    end: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    cursor: str | None = Query(None, description="Resume after the row this cursor points at"),
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("audit:export")),
+) -> StreamingResponse:
+    """Stream matching audit rows oldest first.
+
+    Each NDJSON record and CSV row ends with a ``cursor`` field. To resume an
+    interrupted download, pass the ``cursor`` of the last complete record
+    received with the same filters; a resumed CSV export omits the header.
+    """
+    if cursor is not None:
+        _decode_cursor(cursor)
+    filters = audit_filters(
+        current_user.agency_id,
+        event_type=event_type,
+        actor_user_id=actor_user_id,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        start=start,
+        end=end,
+    )
+    metadata = get_request_metadata(request)
+    await log_event(
+        db,
+        agency_id=current_user.agency_id,
+        actor_user_id=current_user.id,
+        event_type="audit_export",
+        resource_type="audit_log",
+        message=f"Admin exported audit log ({fmt}, start={start}, end={end})",
+        **metadata,
+    )
+
+    filename = f"audit-{current_user.agency_id}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        iter_audit_export(
+            agency_sessions(SessionLocal, current_user.agency_id), filters, fmt=fmt, compress=gzip, cursor=cursor
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,32 +1,94 @@
 from datetime import datetime, timedelta, timezone
+import time
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_request_metadata, revoke_refresh_token, store_refresh_token
+from app.api.deps import (
+    get_auth_db,
+    get_request_metadata,
+    optional_oauth2_scheme,
+    query_budget,
+    revoke_refresh_token,
+    rotate_refresh_token,
+    store_refresh_token,
+)
 from app.core.config import settings
-from app.models.refresh_token import RefreshToken
+from app.core.metrics import LatencyStats
+from app.db.session import run_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RefreshRequest
 from app.schemas.token import Token
 from app.services.audit import log_event
+from app.services.password_hashing import HashPoolSaturated
+from app.services.rate_limit import login_rate_limiter
+from app.services.revocation import revocation_index
 from app.services.security import (
+    InvalidTokenError,
     create_access_token,
     create_refresh_token,
-    hash_refresh_token,
-    verify_password,
+    decode_token,
+    password_hasher,
 )
+from app.services.telemetry import logins, token_refreshes
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+login_latency = LatencyStats()
+
+AUTH_RESULTS = {
+    status.HTTP_401_UNAUTHORIZED: "failure",
+    status.HTTP_429_TOO_MANY_REQUESTS: "rate_limited",
+    status.HTTP_503_SERVICE_UNAVAILABLE: "unavailable",
+}
+
+
+def _get_user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HashPoolSaturated as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        ) from exc
+
 
-@router.post("/login", response_model=Token)
-def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)) -> Token:
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
-        metadata = get_request_metadata(request)
-        log_event(
+@router.post("/login", response_model=Token, dependencies=[Depends(query_budget(4))])
+async def login(payload: LoginRequest, request: Request, db: Session | AsyncSession = Depends(get_auth_db)) -> Token:
+    started = time.perf_counter()
+    result = "error"
+    try:
+        token = await _login(payload, request, db)
+        result = "success"
+        return token
+    except HTTPException as exc:
+        result = AUTH_RESULTS.get(exc.status_code, "error")
+        raise
+    finally:
+        logins.inc(result)
+        login_latency.observe((time.perf_counter() - started) * 1000)
+
+
+async def _login(payload: LoginRequest, request: Request, db: Session | AsyncSession) -> Token:
+    metadata = get_request_metadata(request)
+    retry_after = login_rate_limiter.retry_after(metadata["ip_address"], payload.email)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = await run_db(db, _get_user_by_email, payload.email)
+    verified, new_hash = await _verify_password(payload.password, user.hashed_password) if user else (False, None)
+    if not verified:
+        await log_event(
             db,
             agency_id=user.agency_id if user else None,
             actor_user_id=user.id if user else None,
@@ -34,22 +96,35 @@ def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)
             message="Invalid credentials",
             **metadata,
         )
+        for kind in login_rate_limiter.record_failure(metadata["ip_address"], payload.email):
+            await log_event(
+                db,
+                agency_id=user.agency_id if user else None,
+                actor_user_id=user.id if user else None,
+                event_type="auth_lockout",
+                message=f"Login locked out by {kind} after repeated failures",
+                **metadata,
+            )
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    login_rate_limiter.record_success(payload.email)
+
+    user_id, agency_id = user.id, user.agency_id
+    if new_hash:
+        user.hashed_password = new_hash
     access_token = create_access_token(
-        subject=str(user.id),
+        subject=str(user_id),
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
     )
     refresh_token = create_refresh_token(
-        subject=str(user.id),
+        subject=str(user_id),
         expires_delta=timedelta(days=settings.refresh_token_expire_days),
     )
-    store_refresh_token(db, user.id, refresh_token, settings.refresh_token_expire_days)
-    metadata = get_request_metadata(request)
-    log_event(
+    await run_db(db, store_refresh_token, user_id, refresh_token, settings.refresh_token_expire_days)
+    await log_event(
         db,
-        agency_id=user.agency_id,
-        actor_user_id=user.id,
+        agency_id=agency_id,
+        actor_user_id=user_id,
         event_type="auth_success",
         message="User logged in",
         **metadata,
@@ -57,61 +132,83 @@ def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)
     return Token(access_token=access_token, refresh_token=refresh_token)
 
 
-@router.post("/refresh", response_model=Token)
-def refresh_token(payload: RefreshRequest, request: Request, db: Session = Depends(get_db)) -> Token:
+@router.post("/refresh", response_model=Token, dependencies=[Depends(query_budget(3))])
+async def refresh_token(
+    payload: RefreshRequest,
+    request: Request,
+    db: Session | AsyncSession = Depends(get_auth_db),
+) -> Token:
+    result = "error"
     try:
-        token_payload = jwt.decode(payload.refresh_token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        token = await _refresh(payload, request, db)
+        result = "success"
+        return token
+    except HTTPException as exc:
+        result = AUTH_RESULTS.get(exc.status_code, "error")
+        raise
+    finally:
+        token_refreshes.inc(result)
+
+
+async def _refresh(payload: RefreshRequest, request: Request, db: Session | AsyncSession) -> Token:
+    try:
+        token_payload = decode_token(payload.refresh_token)
         if token_payload.get("type") != "refresh":
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
         user_id = int(token_payload.get("sub"))
-    except (JWTError, ValueError, TypeError) as exc:
+    except (InvalidTokenError, ValueError, TypeError) as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
 
-    token_hash = hash_refresh_token(payload.refresh_token)
-    stored = (
-        db.query(RefreshToken)
-        .filter(
-            RefreshToken.token_hash == token_hash,
-            RefreshToken.revoked_at.is_(None),
-        )
-        .first()
-    )
-    if not stored or stored.expires_at < datetime.now(timezone.utc):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
-
-    revoke_refresh_token(db, payload.refresh_token)
-
     access_token = create_access_token(
-        subject=str(user.id),
+        subject=str(user_id),
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
     )
     new_refresh_token = create_refresh_token(
-        subject=str(user.id),
+        subject=str(user_id),
         expires_delta=timedelta(days=settings.refresh_token_expire_days),
     )
-    store_refresh_token(db, user.id, new_refresh_token, settings.refresh_token_expire_days)
-
-    metadata = get_request_metadata(request)
-    log_event(
+    agency_id = await run_db(
         db,
-        agency_id=user.agency_id,
-        actor_user_id=user.id,
-        event_type="auth_refresh",
-        message="Refresh token rotated",
-        **metadata,
+        rotate_refresh_token,
+        payload.refresh_token,
+        user_id,
+        new_refresh_token,
+        settings.refresh_token_expire_days,
+        {
+            "event_type": "auth_refresh",
+            "message": "Refresh token rotated",
+            **get_request_metadata(request),
+        },
     )
+    if agency_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
     return Token(access_token=access_token, refresh_token=new_refresh_token)
 
 
-@router.post("/logout")
-def logout(payload: RefreshRequest, request: Request, db: Session = Depends(get_db)) -> dict:
-    revoke_refresh_token(db, payload.refresh_token)
+async def _revoke_access_token(db: Session | AsyncSession, token: str) -> None:
+    try:
+        claims = decode_token(token, cache=True)
+    except InvalidTokenError:
+        return
+    jti, expires_at = claims.get("jti"), claims.get("exp")
+    if claims.get("type") != "access" or not jti or not isinstance(expires_at, (int, float)):
+        return
+    if not revocation_index.is_revoked(jti):
+        await run_db(db, revocation_index.revoke, jti, datetime.fromtimestamp(expires_at, timezone.utc))
+
+
+@router.post("/logout", dependencies=[Depends(query_budget(3))])
+async def logout(
+    payload: RefreshRequest,
+    request: Request,
+    db: Session | AsyncSession = Depends(get_auth_db),
+    access_token: str | None = Depends(optional_oauth2_scheme),
+) -> dict:
+    await run_db(db, revoke_refresh_token, payload.refresh_token)
+    if access_token:
+        await _revoke_access_token(db, access_token)
     metadata = get_request_metadata(request)
-    log_event(
+    await log_event(
         db,
         agency_id=None,
         actor_user_id=None,
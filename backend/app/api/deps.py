@@ -1,56 +1,123 @@
 from datetime import datetime, timedelta, timezone
-from typing import Generator
+from typing import AsyncGenerator
 
 from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.instrumentation import current_request_stats
+from app.db.replicas import READ_REPLICA_KEY, USER_KEY
+from app.db.session import AsyncSessionLocal, SessionLocal, run_db
+from app.db.tenancy import bypass_rls, restrict_rls_to_agency, scope_to_agency
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
-from app.services.security import hash_refresh_token
+from app.services.audit import add_event
+from app.services.authorization import authorization_index
+from app.services.principal_cache import Principal, principal_cache
+from app.services.revocation import revocation_index
+from app.services.security import InvalidTokenError, decode_token, hash_refresh_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[Session | AsyncSession, None]:
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await run_in_threadpool(db.close)
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: Session | AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
+) -> Principal:
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = decode_token(token, cache=True)
         if payload.get("type") != "access":
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
         user_id = int(payload.get("sub"))
-    except (JWTError, ValueError, TypeError) as exc:
+    except (InvalidTokenError, ValueError, TypeError) as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
+    if revocation_index.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    db.info[USER_KEY] = user_id
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        restrict_rls_to_agency(db, principal.agency_id)
+    else:
+        principal = await run_db(db, _load_principal, user_id)
+    if not principal or not principal.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
-    return user
+    return principal
+
+
+def _load_principal(db: Session, user_id: int) -> Principal | None:
+    """Look the user up across agencies, then hold the rest of the request to their agency."""
+    bypass_rls(db)
+    principal = principal_cache.fetch(db, user_id)
+    if principal is not None:
+        restrict_rls_to_agency(db, principal.agency_id)
+    return principal
+
+
+async def get_auth_db(db: Session | AsyncSession = Depends(get_db)) -> Session | AsyncSession:
+    """Session for auth endpoints, which find users before any agency is known; see ``bypass_rls``."""
+    bypass_rls(db)
+    return db
+
+
+async def use_read_replica(db: Session | AsyncSession = Depends(get_db)) -> None:
+    """Let this request's plain SELECTs go to a read replica; list it before other dependencies."""
+    db.info[READ_REPLICA_KEY] = True
+
+
+async def get_tenant_db(
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Session | AsyncSession:
+    await run_db(db, scope_to_agency, current_user.agency_id)
+    return db
 
 
 def require_role(required_role: str):
-    def _role_dependency(user: User = Depends(get_current_user)) -> User:
-        role_names = {assignment.role.name for assignment in user.roles}
-        if required_role not in role_names:
+    async def _role_dependency(user: Principal = Depends(get_current_user)) -> Principal:
+        if required_role not in user.roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
 
     return _role_dependency
 
 
+def require_permission(permission: str):
+    async def _permission_dependency(user: Principal = Depends(get_current_user)) -> Principal:
+        if not authorization_index.allows(user.role_ids, permission):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return user
+
+    return _permission_dependency
+
+
+def query_budget(limit: int):
+    """Declare the most SQL statements a route may run; see ``DB_QUERY_BUDGET_STRICT``."""
+
+    async def _query_budget() -> None:
+        stats = current_request_stats()
+        if stats is not None:
+            stats.query_budget = limit
+
+    return _query_budget
+
+
 def get_request_metadata(request: Request) -> dict:
     return {
         "ip_address": request.client.host if request.client else None,
@@ -60,14 +127,61 @@ def get_request_metadata(request: Request) -> dict:
 
 def revoke_refresh_token(db: Session, token: str) -> None:
     token_hash = hash_refresh_token(token)
-    refresh = (
-        db.query(RefreshToken)
-        .filter(RefreshToken.token_hash == token_hash, RefreshToken.revoked_at.is_(None))
-        .first()
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == token_hash, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
     )
-    if refresh:
-        refresh.revoked_at = datetime.now(timezone.utc)
-        db.commit()
+    db.commit()
+
+
+def rotate_refresh_token(
+    db: Session,
+    token: str,
+    user_id: int,
+    new_token: str,
+    expires_in_days: int,
+    audit_fields: dict,
+) -> int | None:
+    """Atomically revoke ``token`` and store ``new_token`` in one transaction.
+
+    The revoke only matches an unrevoked, unexpired token belonging to an
+    active ``user_id``, so of two concurrent refreshes with the same token only
+    one can succeed. Returns the user's agency id, or None if nothing matched.
+    """
+    now = datetime.now(timezone.utc)
+    active_agency_id = (
+        select(User.agency_id)
+        .where(User.id == RefreshToken.user_id, User.is_active.is_(True))
+        .scalar_subquery()
+    )
+    agency_id = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+            RefreshToken.user_id == user_id,
+            active_agency_id.is_not(None),
+        )
+        .values(revoked_at=now)
+        .returning(active_agency_id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if agency_id is None:
+        db.rollback()
+        return None
+
+    db.execute(
+        insert(RefreshToken).values(
+            user_id=user_id,
+            token_hash=hash_refresh_token(new_token),
+            expires_at=now + timedelta(days=expires_in_days),
+        )
+    )
+    add_event(db, agency_id=agency_id, actor_user_id=user_id, **audit_fields)
+    db.commit()
+    return agency_id
 
 
 def store_refresh_token(db: Session, user_id: int, token: str, expires_in_days: int) -> None:
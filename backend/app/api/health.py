@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
+
+from app.services.health import readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("", include_in_schema=False)
+@router.get("/live")
+def live() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready() -> Response:
+    result = await readiness.check()
+    code = status.HTTP_200_OK if result["status"] == "ok" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(result, status_code=code, headers={"Cache-Control": "no-store"})
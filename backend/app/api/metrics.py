@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.telemetry import metrics_snapshots, render
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    families = await run_in_threadpool(metrics_snapshots.gather)
+    return Response(content=render(families), media_type=CONTENT_TYPE)
@@ -0,0 +1,25 @@
+from typing import Any, Sequence
+
+from fastapi.responses import ORJSONResponse
+import orjson
+from sqlalchemy import Row
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """orjson-rendered response for content the query already shaped to the route's schema.
+
+    Returning one from an endpoint skips FastAPI's response-model validation
+    and encoding pass; the route's ``response_model`` still documents the
+    shape. Only pass rows projected to exactly the schema's fields.
+    Datetimes render as pydantic does, with ``Z`` for UTC.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def records(rows: Sequence[Row]) -> list[dict]:
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
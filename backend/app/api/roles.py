@@ -1,61 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_request_metadata, require_role
+from app.api.deps import get_db, get_request_metadata, query_budget, require_permission, use_read_replica
+from app.api.responses import TrustedJSONResponse, records
+from app.db.session import run_db
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
 from app.schemas.role import RoleAssign, RoleRead
 from app.services.audit import log_event
+from app.services.authorization import authorization_index
+from app.services.principal_cache import Principal, principal_cache
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
 
-@router.get("", response_model=list[RoleRead])
-def list_roles(db: Session = Depends(get_db), current_user: User = Depends(require_role("admin"))) -> list[RoleRead]:
-    return db.query(Role).all()
+def _list_roles(db: Session) -> list[dict]:
+    return records(db.execute(select(Role.id, Role.name).order_by(Role.id)).all())
 
 
-@router.post("/assign")
-def assign_role(
-    payload: RoleAssign,
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("admin")),
-) -> dict:
-    user = (
-        db.query(User)
-        .filter(User.id == payload.user_id, User.agency_id == current_user.agency_id)
-        .first()
-    )
-    if not user:
+def _assign_role(db: Session, user_id: int, agency_id: int, role_name: str) -> None:
+    role_id = authorization_index.role_id(role_name) or db.scalar(select(Role.id).where(Role.name == role_name))
+    if role_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+
+    try:
+        result = db.execute(
+            insert(UserRole).from_select(
+                ["user_id", "role_id"],
+                select(User.id, literal(role_id)).where(User.id == user_id, User.agency_id == agency_id),
+            )
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Role already assigned") from None
+    if not result.rowcount:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    principal_cache.invalidate(user_id)
 
-    role = db.query(Role).filter(Role.name == payload.role_name).first()
-    if not role:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
 
-    existing = (
-        db.query(UserRole)
-        .filter(UserRole.user_id == user.id, UserRole.role_id == role.id)
-        .first()
-    )
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Role already assigned")
+@router.get(
+    "",
+    response_model=list[RoleRead],
+    response_class=TrustedJSONResponse,
+    dependencies=[Depends(use_read_replica), Depends(query_budget(2))],
+)
+async def list_roles(
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("roles:read")),
+) -> TrustedJSONResponse:
+    return TrustedJSONResponse(await run_db(db, _list_roles))
+
 
-    assignment = UserRole(user_id=user.id, role_id=role.id)
-    db.add(assignment)
-    db.commit()
+@router.post("/assign", dependencies=[Depends(query_budget(4))])
+async def assign_role(
+    payload: RoleAssign,
+    request: Request,
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("roles:assign")),
+) -> dict:
+    await run_db(db, _assign_role, payload.user_id, current_user.agency_id, payload.role_name)
 
     metadata = get_request_metadata(request)
-    log_event(
+    await log_event(
         db,
         agency_id=current_user.agency_id,
         actor_user_id=current_user.id,
         event_type="role_assigned",
         resource_type="user",
-        resource_id=str(user.id),
-        message=f"Assigned role {role.name}",
+        resource_id=str(payload.user_id),
+        message=f"Assigned role {payload.role_name}",
         **metadata,
     )
     return {"status": "assigned"}
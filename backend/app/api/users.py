@@ -1,22 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import csv
+import io
+from tempfile import SpooledTemporaryFile
+
+from anyio import from_thread
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db, get_request_metadata, require_role
+from app.api.deps import (
+    get_current_user,
+    get_db,
+    get_request_metadata,
+    get_tenant_db,
+    query_budget,
+    require_permission,
+    use_read_replica,
+)
+from app.api.responses import TrustedJSONResponse, records
+from app.core.config import settings
+from app.db.session import SessionLocal, run_db
+from app.db.tenancy import agency_sessions
+from app.models.role import Role
 from app.models.user import User
-from app.schemas.user import UserRead
+from app.models.user_role import UserRole
+from app.schemas.user import UserImportResult, UserPage, UserRead
 from app.services.audit import PHI_EVENT, log_event
+from app.services.password_hashing import HashPoolSaturated
+from app.services.principal_cache import Principal
+from app.services.security import password_hasher
+from app.services.user_import import import_users
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _list_users(
+    db: Session,
+    *,
+    limit: int,
+    after: int | None,
+    is_active: bool | None,
+    role: str | None,
+    include_total: bool,
+) -> dict:
+    filters = []
+    if is_active is not None:
+        filters.append(User.is_active.is_(is_active))
+    if role is not None:
+        filters.append(
+            select(UserRole.id)
+            .join(Role, Role.id == UserRole.role_id)
+            .where(UserRole.user_id == User.id, Role.name == role)
+            .exists()
+        )
+
+    query = select(User.id, User.agency_id, User.email, User.is_active).where(*filters)
+    if after is not None:
+        query = query.where(User.id > after)
+    rows = db.execute(query.order_by(User.id).limit(limit + 1)).all()
 
-@router.get("/me", response_model=UserRead)
-def read_me(
+    page = {"items": records(rows[:limit]), "next_cursor": None, "total": None}
+    if len(rows) > limit:
+        page["next_cursor"] = rows[limit - 1].id
+    if include_total:
+        page["total"] = db.scalar(select(func.count()).select_from(User).where(*filters))
+    return page
+
+
+def _get_user(db: Session, user_id: int) -> User | None:
+    return db.query(User).filter(User.id == user_id).first()
+
+
+@router.get(
+    "/me",
+    response_model=UserRead,
+    dependencies=[Depends(use_read_replica), Depends(query_budget(2))],
+)
+async def read_me(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session | AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ) -> UserRead:
     metadata = get_request_metadata(request)
-    log_event(
+    await log_event(
         db,
         agency_id=current_user.agency_id,
         actor_user_id=current_user.id,
@@ -29,15 +100,33 @@ def read_me(
     return current_user
 
 
-@router.get("", response_model=list[UserRead])
-def list_users(
+@router.get(
+    "",
+    response_model=UserPage,
+    response_class=TrustedJSONResponse,
+    dependencies=[Depends(use_read_replica), Depends(query_budget(4))],
+)
+async def list_users(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("admin")),
-) -> list[UserRead]:
-    users = db.query(User).filter(User.agency_id == current_user.agency_id).all()
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: int | None = Query(None, description="next_cursor from the previous page"),
+    is_active: bool | None = None,
+    role: str | None = None,
+    include_total: bool = False,
+    db: Session | AsyncSession = Depends(get_tenant_db),
+    current_user: Principal = Depends(require_permission("users:read")),
+) -> TrustedJSONResponse:
+    page = await run_db(
+        db,
+        _list_users,
+        limit=limit,
+        after=cursor,
+        is_active=is_active,
+        role=role,
+        include_total=include_total,
+    )
     metadata = get_request_metadata(request)
-    log_event(
+    await log_event(
         db,
         agency_id=current_user.agency_id,
         actor_user_id=current_user.id,
@@ -46,25 +135,85 @@ def list_users(
         message="Admin listed users",
         **metadata,
     )
-    return users
+    return TrustedJSONResponse(page)
+
+
+def _hash_on_shared_pool(passwords: list[str]) -> list[str]:
+    return from_thread.run(password_hasher.hash_many, passwords)
+
+
+def _import_csv(upload, *, agency_id: int, **kwargs) -> dict:
+    with upload:
+        upload.seek(0)
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        report = import_users(
+            agency_sessions(SessionLocal, agency_id),
+            lines,
+            agency_id=agency_id,
+            chunk_size=settings.user_import_chunk_size,
+            hash_many=_hash_on_shared_pool,
+            **kwargs,
+        )
+    return vars(report)
 
 
-@router.get("/{user_id}", response_model=UserRead)
-def read_user(
+@router.post("/import", response_model=UserImportResult)
+async def import_agency_users(
+    request: Request,
+    current_user: Principal = Depends(require_permission("users:write")),
+) -> UserImportResult:
+    upload = SpooledTemporaryFile(max_size=1024 * 1024)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.user_import_max_bytes:
+            upload.close()
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="CSV too large")
+        upload.write(chunk)
+
+    # Chunks are committed as they go, so rows before a failure stay imported.
+    try:
+        return await run_in_threadpool(
+            _import_csv,
+            upload,
+            agency_id=current_user.agency_id,
+            actor_user_id=current_user.id,
+            **get_request_metadata(request),
+        )
+    except HashPoolSaturated as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is saturated; earlier rows may have been imported",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        ) from exc
+    except UnicodeDecodeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV is not valid UTF-8 (byte {exc.start}); earlier rows may have been imported",
+        ) from exc
+    except csv.Error as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Malformed CSV: {exc}; earlier rows may have been imported",
+        ) from exc
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserRead,
+    dependencies=[Depends(use_read_replica), Depends(query_budget(3))],
+)
+async def read_user(
     user_id: int,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("admin")),
+    db: Session | AsyncSession = Depends(get_tenant_db),
+    current_user: Principal = Depends(require_permission("users:read")),
 ) -> UserRead:
-    user = (
-        db.query(User)
-        .filter(User.id == user_id, User.agency_id == current_user.agency_id)
-        .first()
-    )
+    user = await run_db(db, _get_user, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     metadata = get_request_metadata(request)
-    log_event(
+    await log_event(
         db,
         agency_id=current_user.agency_id,
         actor_user_id=current_user.id,
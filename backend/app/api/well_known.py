@@ -0,0 +1,20 @@
+import json
+
+from fastapi import APIRouter, Response
+
+from app.services.security import jwt_backend
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+JWKS_MAX_AGE_SECONDS = 300
+
+_jwks_body = json.dumps({"keys": jwt_backend.jwks()}).encode()
+
+
+@router.get("/jwks.json")
+def jwks() -> Response:
+    return Response(
+        content=_jwks_body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE_SECONDS}"},
+    )
@@ -4,10 +4,73 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "Home Care Platform"
     database_url: str = "sqlite:///./dev.db"
+    async_database_url: str | None = None
+    database_replica_urls: list[str] = []
+    db_replica_max_lag_seconds: float = 5.0
+    db_replica_check_seconds: float = 5.0
+    db_read_your_writes_seconds: float = 10.0
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_slow_checkout_ms: float = 100.0
+    db_slow_query_ms: float = 200.0
+    db_query_budget_strict: bool = False
+    metrics_multiproc_dir: str | None = None
+    metrics_snapshot_interval_seconds: float = 5.0
+    health_cache_seconds: float = 2.0
+    health_db_timeout_seconds: float = 2.0
+    health_max_pool_utilization: float = 0.9
+    health_max_audit_backlog: float = 0.8
+    shutdown_drain_seconds: float = 0.0
+    startup_warmup: bool = False
     jwt_secret_key: str = "change-me"
     jwt_algorithm: str = "HS256"
+    jwt_backend: str = "jose"
+    jwt_keys_dir: str | None = None
+    jwt_active_kid: str | None = None
+    jwt_decode_cache_size: int = 4096
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    token_reaper_interval_seconds: int = 0
+    token_reaper_batch_size: int = 1000
+    token_reaper_batch_pause_ms: int = 50
+    token_revoked_grace_hours: int = 24
+    token_revocation_poll_seconds: float = 5.0
+    audit_durability: str = "sync"
+    audit_queue_size: int = 10000
+    audit_batch_size: int = 500
+    audit_flush_interval_ms: int = 50
+    audit_coalesce_window_seconds: float = 0.0
+    audit_coalesce_max_keys: int = 100000
+    audit_non_coalescible_events: list[str] = [
+        "auth_success",
+        "auth_failure",
+        "auth_lockout",
+        "auth_refresh",
+        "auth_logout",
+        "audit_read",
+        "audit_export",
+        "role_assigned",
+        "users_imported",
+    ]
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_size: int = 10000
+    authorization_refresh_seconds: int = 60
+    tenant_rls: bool = False
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    password_hash_retry_after_seconds: int = 2
+    login_rate_limit_store: str = "memory"
+    login_rate_limit_max_keys: int = 100000
+    login_failure_window_seconds: int = 900
+    login_max_failures_per_ip: int = 50
+    login_max_failures_per_email: int = 5
+    user_import_chunk_size: int = 500
+    user_import_hash_workers: int = 4
+    user_import_max_bytes: int = 50 * 1024 * 1024
 
 
 settings = Settings()
@@ -0,0 +1,136 @@
+from bisect import bisect_left
+from itertools import accumulate, count
+from operator import add
+import threading
+from typing import Any, Callable
+import weakref
+
+
+class LatencyStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if elapsed_ms > self.max_ms:
+                self.max_ms = elapsed_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": self.total_ms / self.count if self.count else 0.0,
+                "max_ms": self.max_ms,
+                "total_ms": self.total_ms,
+            }
+
+
+class _ShardOwner:
+    """Held only by a thread's ``threading.local`` slot, so it is freed when that thread exits."""
+
+
+class _ThreadShards:
+    """Per-thread dicts of label values to totals.
+
+    When a thread exits its shard is folded into one retired shard with
+    ``combine``, so churning threadpools do not leave a shard per dead thread.
+    """
+
+    def __init__(self, combine: Callable[[Any, Any], Any]) -> None:
+        self._combine = combine
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: dict[int, dict] = {}
+        self._retired: dict = {}
+        self._ids = count()
+
+    def local(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            owner = self._local.owner = _ShardOwner()
+            with self._lock:
+                shard_id = next(self._ids)
+                self._shards[shard_id] = shard
+            weakref.finalize(owner, self._retire, shard_id)
+        return shard
+
+    def all(self) -> list[dict]:
+        with self._lock:
+            return [*self._shards.values(), dict(self._retired)]
+
+    def _retire(self, shard_id: int) -> None:
+        with self._lock:
+            shard = self._shards.pop(shard_id)
+            for key, value in shard.items():
+                previous = self._retired.get(key)
+                self._retired[key] = value if previous is None else self._combine(previous, value)
+
+
+class Counter:
+    """Monotonic counts by label values.
+
+    Each thread increments its own shard, so the hot path takes no lock;
+    ``values`` sums the shards when scraped.
+    """
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._shards = _ThreadShards(add)
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        shard = self._shards.local()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        totals: dict[tuple[str, ...], float] = {}
+        for shard in self._shards.all():
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+def _add_buckets(left: list, right: list) -> list:
+    return [[a + b for a, b in zip(left[0], right[0])], left[1] + right[1]]
+
+
+class LabeledHistogram:
+    """Bucketed observations by label values, sharded per thread like ``Counter``."""
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.labels = labels
+        self._shards = _ThreadShards(_add_buckets)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        shard = self._shards.local()
+        entry = shard.get(label_values)
+        if entry is None:
+            entry = shard[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def values(self) -> dict[tuple[str, ...], tuple[list[int], float]]:
+        """Cumulative bucket counts (the last one is +Inf, i.e. the total count) and sum per label set."""
+        totals: dict[tuple[str, ...], tuple[list[int], float]] = {}
+        for shard in self._shards.all():
+            for key, (counts, total) in list(shard.items()):
+                merged, merged_sum = totals.get(key, ([0] * len(counts), 0.0))
+                totals[key] = ([a + b for a, b in zip(merged, counts)], merged_sum + total)
+        return {key: (list(accumulate(counts)), total) for key, (counts, total) in totals.items()}
+
+
+class Gauge(Counter):
+    """A ``Counter`` that may also go down, for values such as in-flight requests."""
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
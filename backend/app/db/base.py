@@ -1,7 +1,9 @@
 from app.models.base import Base
 from app.models.agency import Agency
 from app.models.audit_log import AuditLog
+from app.models.permission import Permission, RolePermission
 from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
@@ -10,7 +12,10 @@ __all__ = [
     "Base",
     "Agency",
     "AuditLog",
+    "Permission",
     "RefreshToken",
+    "RevokedToken",
+    "RolePermission",
     "Role",
     "User",
     "UserRole",
@@ -0,0 +1,197 @@
+from contextvars import ContextVar
+from functools import lru_cache
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Counter, LabeledHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDbStats:
+    __slots__ = (
+        "checkouts",
+        "checkout_wait_ms",
+        "peak_in_use",
+        "overflow_checkouts",
+        "queries",
+        "query_ms",
+        "query_budget",
+    )
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.checkout_wait_ms = 0.0
+        self.peak_in_use = 0
+        self.overflow_checkouts = 0
+        self.queries = 0
+        self.query_ms = 0.0
+        self.query_budget: int | None = None
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+_request_stats: ContextVar[RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def begin_request_stats() -> RequestDbStats:
+    stats = RequestDbStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> RequestDbStats | None:
+    return _request_stats.get()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement to its shape: literals and placeholders become ``?`` and value lists ``(?)``."""
+    normalized = " ".join(statement.split())
+    normalized = _PLACEHOLDERS.sub("?", normalized)
+    normalized = _LITERALS.sub("?", normalized)
+    return _VALUE_LISTS.sub("(?)", normalized)
+
+
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class QueryStats:
+    """SQL metrics per statement and per request; the sharded types record without a lock."""
+
+    def __init__(self) -> None:
+        self.statement_duration = LabeledHistogram(
+            "db_statement_duration_seconds", "SQL statement time.", DB_TIME_BUCKETS
+        )
+        self.request_queries = LabeledHistogram(
+            "db_request_queries", "SQL statements per HTTP request.", (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+        )
+        self.request_duration = LabeledHistogram(
+            "db_request_duration_seconds", "SQL statement time per HTTP request.", DB_TIME_BUCKETS
+        )
+        self.slow_queries = Counter("db_slow_queries_total", "Slow SQL statements.")
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        self.statement_duration.observe(elapsed_ms / 1000)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_ms += elapsed_ms
+        if elapsed_ms >= settings.db_slow_query_ms:
+            self.slow_queries.inc()
+            logger.warning("Slow query (%.1f ms): %s", elapsed_ms, normalize_sql(statement))
+
+    def record_request(self, stats: RequestDbStats) -> None:
+        self.request_queries.observe(stats.queries)
+        self.request_duration.observe(stats.query_ms / 1000)
+
+
+query_stats = QueryStats()
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.checkouts = Counter("db_pool_checkouts_total", "Pool checkouts.")
+        self.overflow_checkouts = Counter("db_pool_overflow_checkouts_total", "Overflows.")
+        self.disconnects = Counter("db_pool_disconnects_total", "Connection disconnects that invalidated the pool.")
+        self.checkout_wait = Counter(
+            "db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection."
+        )
+
+    def record_checkout(self, in_use: int, overflow: bool) -> None:
+        self.checkouts.inc()
+        if overflow:
+            self.overflow_checkouts.inc()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.checkouts += 1
+            stats.peak_in_use = max(stats.peak_in_use, in_use)
+            if overflow:
+                stats.overflow_checkouts += 1
+
+    def record_disconnect(self) -> None:
+        self.disconnects.inc()
+
+
+pool_stats = PoolStats()
+
+
+class _TimedCheckoutMixin:
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            pool_stats.checkout_wait.inc(amount=elapsed_ms / 1000)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.checkout_wait_ms += elapsed_ms
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> None:
+    pool = engine.pool
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        queued = isinstance(pool, QueuePool)
+        in_use = pool.checkedout() if queued else 1
+        pool_stats.record_checkout(in_use, queued and in_use > pool.size())
+
+    # The start time lives on the execution context rather than the connection:
+    # after_cursor_execute never fires for a statement that raises, so anything
+    # kept per connection would outlive it.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "query_started", None)
+        if started is not None:
+            query_stats.record_statement(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context) -> None:
+        if context.is_disconnect:
+            # SQLAlchemy already invalidates the whole pool on a disconnect; only count it.
+            pool_stats.record_disconnect()
+            logger.warning("Database disconnect detected; connection pool invalidated")
+
+
+def pool_status(engine: Engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -0,0 +1,99 @@
+from datetime import date
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+AUDIT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+_IN_RANGE = "created_at >= :lower AND created_at < :upper"
+_PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def audit_partition_name(month: date) -> str:
+    return f"{AUDIT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def create_audit_partitions(
+    connection: Connection, start: date, months: int, *, has_default: bool = True
+) -> list[str]:
+    """Create monthly partitions of audit_logs covering ``months`` months from ``start``.
+
+    Rows already in the DEFAULT partition for a new month would make the
+    CREATE fail, so in that case DEFAULT is detached, the rows are moved into
+    the new partition and DEFAULT is attached again, all in the caller's
+    transaction. Detaching takes an exclusive lock on audit_logs until commit.
+    Pass ``has_default=False`` while the table has no DEFAULT partition yet.
+    """
+    existing = {name for name, _ in list_audit_partitions(connection)} if has_default else set()
+    created = []
+    month = month_start(start)
+    for _ in range(months):
+        upper = add_months(month, 1)
+        name = audit_partition_name(month)
+        if name not in existing:
+            bounds = {"lower": month, "upper": upper}
+            stranded = has_default and connection.execute(
+                text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {_IN_RANGE})"), bounds
+            ).scalar()
+            if stranded:
+                connection.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {AUDIT_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                )
+            )
+            if stranded:
+                connection.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {_IN_RANGE} RETURNING *) "
+                        f"INSERT INTO {name} SELECT * FROM moved"
+                    ),
+                    bounds,
+                )
+                connection.execute(text(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        created.append(name)
+        month = upper
+    return created
+
+
+def list_audit_partitions(connection: Connection) -> list[tuple[str, date]]:
+    names = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": AUDIT_TABLE},
+    ).scalars()
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def detach_audit_partitions(connection: Connection, before: date) -> list[str]:
+    """Detach monthly partitions that end on or before ``before``.
+
+    Detached partitions stay in the database as ordinary tables, so they can be
+    archived and dropped separately without touching the live table.
+    """
+    detached = []
+    for name, month in list_audit_partitions(connection):
+        if add_months(month, 1) <= before:
+            connection.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+    return detached
@@ -0,0 +1,188 @@
+from itertools import count
+import logging
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+READ_REPLICA_KEY = "read_replica"
+PRIMARY_OPTION = "read_from_primary"
+USER_KEY = "user_id"
+NON_STICKY_TABLES = frozenset({"audit_logs"})
+
+LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+DEFAULT_LAG_QUERY = "SELECT 0"
+
+
+def _replica_name(engine: Engine) -> str:
+    url = engine.url
+    return f"{url.host}/{url.database}" if url.host else str(url.database)
+
+
+class ReplicaSet:
+    """Read replicas in rotation, with read-your-writes stickiness.
+
+    ``check`` measures each replica's replication lag; a replica that is
+    unreachable or more than ``max_lag`` seconds behind leaves the rotation
+    until a later check finds it caught up. Until the first check no replica
+    is used. A user who wrote within ``stick_seconds`` reads from the primary
+    of this process.
+    """
+
+    def __init__(self, engines: list[Engine], *, max_lag: float, stick_seconds: float) -> None:
+        self.engines = engines
+        self.max_lag = max_lag
+        self.stick_seconds = stick_seconds
+        self._lag: list[float | None] = [None] * len(engines)
+        self._healthy: tuple[Engine, ...] = ()
+        self._next = count()
+        self._sticky: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"replica": 0, "primary_sticky": 0, "primary_unavailable": 0, "check_errors": 0}
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self, user_id: int | None) -> Engine | None:
+        """Pick a replica for a read, or None to read from the primary."""
+        if user_id is not None and self._sticky.get(user_id, 0.0) > time.monotonic():
+            self._record("primary_sticky")
+            return None
+        healthy = self._healthy
+        if not healthy:
+            self._record("primary_unavailable")
+            return None
+        self._record("replica")
+        return healthy[next(self._next) % len(healthy)]
+
+    def mark_write(self, user_id: int) -> None:
+        if self.stick_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._sticky[user_id] = now + self.stick_seconds
+            if len(self._sticky) > 10000:
+                self._sticky = {key: until for key, until in self._sticky.items() if until > now}
+
+    def check(self) -> None:
+        lags = [self._measure(engine) for engine in self.engines]
+        healthy = tuple(engine for engine, lag in zip(self.engines, lags) if lag is not None and lag <= self.max_lag)
+        for engine, before, after in zip(self.engines, self._lag, lags):
+            was_healthy = before is not None and before <= self.max_lag
+            if was_healthy != (after is not None and after <= self.max_lag):
+                logger.warning(
+                    "Replica %s %s rotation (lag %s)",
+                    _replica_name(engine),
+                    "left" if was_healthy else "joined",
+                    "unreachable" if after is None else f"{after:.1f}s",
+                )
+        self._lag = lags
+        self._healthy = healthy
+
+    def metrics(self) -> dict:
+        with self._lock:
+            reads = {key: value for key, value in self._stats.items() if key != "check_errors"}
+            check_errors = self._stats["check_errors"]
+        total = sum(reads.values())
+        return {
+            "reads": reads,
+            "hit_ratio": reads["replica"] / total if total else 0.0,
+            "check_errors": check_errors,
+            "replicas": [
+                {"name": _replica_name(engine), "lag_seconds": lag, "healthy": engine in self._healthy}
+                for engine, lag in zip(self.engines, self._lag)
+            ],
+        }
+
+    def start(self, interval: float) -> None:
+        if not self.engines or interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="replica-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def dispose(self) -> None:
+        for engine in self.engines:
+            engine.dispose()
+
+    def _measure(self, engine: Engine) -> float | None:
+        try:
+            with engine.connect() as connection:
+                lag = connection.execute(text(LAG_QUERIES.get(engine.dialect.name, DEFAULT_LAG_QUERY))).scalar()
+        except Exception as exc:
+            self._record("check_errors")
+            logger.debug("Replica %s lag check failed: %s", _replica_name(engine), exc)
+            return None
+        return float(lag or 0)
+
+    def _record(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Replica lag check failed")
+
+
+class RoutingSession(Session):
+    """Session that can send plain SELECTs to a read replica.
+
+    Only sessions flagged with ``info["read_replica"]`` (see
+    ``use_read_replica``) read from a replica; the replica is chosen once per
+    session so a request sees one consistent snapshot. Flushes, DML, locking
+    reads and statements with the ``read_from_primary`` execution option
+    always go to the primary, and a commit that wrote anything besides audit
+    rows makes ``info["user_id"]`` sticky to the primary.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas and clause is not None and clause.is_select and not self._flushing:
+            locking = getattr(clause, "_for_update_arg", None) is not None
+            primary = locking or clause.get_execution_options().get(PRIMARY_OPTION, False)
+            if self.info.get(READ_REPLICA_KEY) and not primary:
+                if "replica_engine" not in self.info:
+                    self.info["replica_engine"] = self.replicas.choose(self.info.get(USER_KEY))
+                if self.info["replica_engine"] is not None:
+                    return self.info["replica_engine"]
+        elif self.replicas and (self._flushing or getattr(clause, "is_dml", False)):
+            table = mapper.local_table if mapper is not None else getattr(clause, "table", None)
+            if getattr(table, "name", None) not in NON_STICKY_TABLES:
+                self.info["wrote"] = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session: RoutingSession) -> None:
+    user_id = session.info.get(USER_KEY)
+    if session.info.pop("wrote", False) and user_id is not None and session.replicas:
+        session.replicas.mark_write(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_writes(session: RoutingSession) -> None:
+    session.info.pop("wrote", None)
@@ -1,17 +1,115 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import AsyncExitStack, ExitStack
+from typing import Any, Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
+from app.db.instrumentation import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, instrument_engine
+from app.db.replicas import ReplicaSet, RoutingSession
+from app.db.tenancy import BYPASS_KEY
 
-if settings.database_url.startswith("sqlite"):
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
-    )
-else:
-    engine = create_engine(
-        settings.database_url,
-        pool_pre_ping=True,
+T = TypeVar("T")
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def _create_engine(url: str):
+    if url.startswith("sqlite") and _is_memory_sqlite(url):
+        # Every new connection would open its own empty database, so all threads share one.
+        created = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    elif url.startswith("sqlite"):
+        created = create_engine(url, connect_args={"check_same_thread": False}, poolclass=InstrumentedQueuePool)
+    else:
+        created = create_engine(url, poolclass=InstrumentedQueuePool, **_pool_options())
+    instrument_engine(created)
+    return created
+
+
+engine = _create_engine(settings.database_url)
+read_replicas = ReplicaSet(
+    [_create_engine(url) for url in settings.database_replica_urls],
+    max_lag=settings.db_replica_max_lag_seconds,
+    stick_seconds=settings.db_read_your_writes_seconds,
+)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+    replicas=read_replicas,
+)
+# Background services and maintenance scripts act for no single agency; see ``bypass_rls``.
+SystemSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+    info={BYPASS_KEY: True},
+)
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_database_url:
+    if read_replicas:
+        # Async sessions bind straight to async_engine; RoutingSession never sees their reads.
+        raise ValueError("DATABASE_REPLICA_URLS is not supported with ASYNC_DATABASE_URL; unset one of them")
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **_pool_options(),
     )
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def run_db(db: Session | AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Async sessions run it on the loop through the async driver; sync sessions
+    run it in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def warm_pool(connections: int) -> None:
+    """Open ``connections`` pooled connections at once so early requests skip the connect handshake."""
+    with ExitStack() as stack:
+        for _ in range(connections):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+
+async def warm_async_pool(connections: int) -> None:
+    if async_engine is None:
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection = await stack.enter_async_context(async_engine.connect())
+            await connection.execute(text("SELECT 1"))
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def dispose_engines() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+    await run_in_threadpool(engine.dispose)
+    await run_in_threadpool(read_replicas.dispose)
@@ -0,0 +1,101 @@
+from functools import partial
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.core.config import settings
+from app.models.base import TenantScoped
+
+AGENCY_KEY = "agency_id"
+RLS_AGENCY_KEY = "rls_agency_id"
+BYPASS_KEY = "bypass_rls"
+SKIP_OPTION = "skip_tenant_scope"
+RLS_SETTING = "app.agency_id"
+RLS_BYPASS_SETTING = "app.bypass_rls"
+
+
+def scope_to_agency(db: Session, agency_id: int) -> None:
+    """Restrict every ORM select, update and delete run by ``db`` to one agency.
+
+    With ``TENANT_RLS`` on PostgreSQL the agency is also published to the
+    ``app.agency_id`` setting of each transaction so row-level security
+    policies enforce the same boundary in the database. Those policies deny
+    every row to a session that neither has an agency nor calls
+    ``bypass_rls``.
+    """
+    db.info[AGENCY_KEY] = agency_id
+    _publish_if_begun(db)
+
+
+def restrict_rls_to_agency(db: Session, agency_id: int) -> None:
+    """Limit ``db`` to one agency under row-level security without adding ORM criteria."""
+    db.info[RLS_AGENCY_KEY] = agency_id
+    _publish_if_begun(db)
+
+
+def agency_sessions(session_factory: Callable[..., Session], agency_id: int) -> Callable[[], Session]:
+    """``session_factory`` whose sessions are limited to ``agency_id`` under row-level security."""
+    return partial(session_factory, info={RLS_AGENCY_KEY: agency_id})
+
+
+def bypass_rls(db: Session) -> None:
+    """Let ``db`` read and write every agency's rows under row-level security.
+
+    For work that runs before any agency is known or on behalf of none:
+    login, token refresh, principal lookup and the audit and token
+    background services. A session that has an agency never bypasses.
+    """
+    db.info[BYPASS_KEY] = True
+    _publish_if_begun(db)
+
+
+def current_agency(db: Session) -> int | None:
+    return db.info.get(AGENCY_KEY)
+
+
+def _rls_values(session: Session) -> tuple[str, str] | None:
+    agency_id = session.info.get(AGENCY_KEY, session.info.get(RLS_AGENCY_KEY))
+    if agency_id is not None:
+        return str(agency_id), "off"
+    if session.info.get(BYPASS_KEY):
+        return "", "on"
+    return None
+
+
+def _publish_if_begun(db: Session) -> None:
+    if settings.tenant_rls and db.in_transaction():
+        _publish_rls(db, db.connection())
+
+
+def _publish_rls(session: Session, connection) -> None:
+    values = _rls_values(session)
+    if values is None or connection.dialect.name != "postgresql":
+        return
+    connection.execute(
+        text("SELECT set_config(:agency_name, :agency, true), set_config(:bypass_name, :bypass, true)"),
+        {"agency_name": RLS_SETTING, "agency": values[0], "bypass_name": RLS_BYPASS_SETTING, "bypass": values[1]},
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _add_tenant_criteria(state: ORMExecuteState) -> None:
+    agency_id = state.session.info.get(AGENCY_KEY)
+    if agency_id is None or state.is_column_load or state.is_relationship_load:
+        return
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    if state.execution_options.get(SKIP_OPTION, False):
+        return
+    state.statement = state.statement.options(
+        *(
+            with_loader_criteria(model, lambda cls: cls.agency_id == agency_id, include_aliases=True)
+            for model in TenantScoped.__subclasses__()
+        )
+    )
+
+
+@event.listens_for(Session, "after_begin")
+def _publish_rls_settings(session: Session, transaction, connection) -> None:
+    if settings.tenant_rls:
+        _publish_rls(session, connection)
@@ -1,14 +1,121 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 
-from app.api import auth, roles, users
 from app.core.config import settings
 
-app = FastAPI(title=settings.app_name)
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db.session import dispose_engines, read_replicas
+    from app.services.audit import audit_coalescer, audit_writer
+    from app.services.authorization import authorization_index
+    from app.services.health import install_drain_handler, readiness
+    from app.services.revocation import revocation_index
+    from app.services.security import password_hasher
+    from app.services.telemetry import metrics_snapshots
+    from app.services.token_reaper import token_reaper
+
+    authorization_index.load()
+    authorization_index.start(settings.authorization_refresh_seconds)
+    revocation_index.load()
+    revocation_index.start(settings.token_revocation_poll_seconds)
+    if read_replicas:
+        read_replicas.check()
+    read_replicas.start(settings.db_replica_check_seconds)
+    audit_writer.start()
+    audit_coalescer.start()
+    password_hasher.start()
+    if settings.startup_warmup:
+        from app.services.warmup import warm_up
+
+        app.state.warmup = await warm_up()
+    token_reaper.start(settings.token_reaper_interval_seconds)
+    metrics_snapshots.start()
+    install_drain_handler(readiness, settings.shutdown_drain_seconds)
+    try:
+        yield
+    finally:
+        readiness.drain()
+        try:
+            metrics_snapshots.stop()
+            token_reaper.stop()
+            password_hasher.shutdown()
+            read_replicas.stop()
+            revocation_index.stop()
+            authorization_index.stop()
+        finally:
+            try:
+                # The coalescer hands what it cannot write to the audit writer, so it stops first.
+                await run_in_threadpool(audit_coalescer.stop)
+            finally:
+                try:
+                    await run_in_threadpool(audit_writer.stop)
+                finally:
+                    await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    """Build the application.
+
+    Routers, models and services are imported here and in ``lifespan``
+    rather than when this module is imported; ``uvicorn --factory
+    app.main:create_app`` builds a fresh app, ``app.main:app`` a shared one.
+    """
+    from app.api import audit, auth, health, metrics, roles, users, well_known
+    from app.db.base import Base
+    from app.db.instrumentation import QueryBudgetExceeded, begin_request_stats, query_stats
+    from app.services.telemetry import request_duration, requests_in_flight
+
+    Base.registry.configure()
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+    @app.middleware("http")
+    async def record_db_usage(request: Request, call_next):
+        stats = begin_request_stats()
+        started = time.perf_counter()
+        requests_in_flight.inc()
+        try:
+            response = await call_next(request)
+        finally:
+            requests_in_flight.dec()
+        route = request.scope.get("route")
+        request_duration.observe(
+            time.perf_counter() - started,
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(response.status_code),
+        )
+        query_stats.record_request(stats)
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.query_ms:.1f};desc="{stats.queries} queries", db-pool;dur={stats.checkout_wait_ms:.1f}'
+        )
+        if stats.checkout_wait_ms >= settings.db_slow_checkout_ms or stats.overflow_checkouts:
+            logger.warning("%s %s waited on the DB pool: %s", request.method, request.url.path, stats.as_dict())
+        if stats.query_budget is not None and stats.queries > stats.query_budget:
+            message = f"{request.method} {request.url.path} ran {stats.queries} queries, budget {stats.query_budget}"
+            if settings.db_query_budget_strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    app.include_router(auth.router)
+    app.include_router(users.router)
+    app.include_router(roles.router)
+    app.include_router(audit.router)
+    app.include_router(well_known.router)
+    app.include_router(metrics.router)
+    app.include_router(health.router)
+    return app
 
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(roles.router)
-@app.get("/health")
-def health():
-    return {"status": "ok"}
 
+def __getattr__(name: str) -> FastAPI:
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    app = globals()["app"] = create_app()
+    return app
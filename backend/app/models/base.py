@@ -3,3 +3,7 @@ from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
     pass
+
+
+class TenantScoped:
+    """Marks a model whose rows belong to one agency through ``agency_id``."""
@@ -1,14 +1,19 @@
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base
+from app.models.base import Base, TenantScoped
 
 
-class User(Base):
+class User(TenantScoped, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_agency_id_id", "agency_id", "id"),
+        Index("ix_users_agency_active_id", "agency_id", "is_active", "id"),
+        Index("ix_users_agency_email", "agency_id", "email"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    agency_id: Mapped[int] = mapped_column(ForeignKey("agencies.id"), nullable=False, index=True)
+    agency_id: Mapped[int] = mapped_column(ForeignKey("agencies.id"), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
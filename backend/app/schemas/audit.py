@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class AuditLogRead(BaseModel):
+    id: int
+    agency_id: int | None
+    actor_user_id: int | None
+    event_type: str
+    resource_type: str | None
+    resource_id: str | None
+    message: str | None
+    ip_address: str | None
+    user_agent: str | None
+    created_at: datetime
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
+    event_count: int = 1
+
+    class Config:
+        from_attributes = True
+
+
+class AuditLogPage(BaseModel):
+    items: list[AuditLogRead]
+    next_cursor: str | None = None
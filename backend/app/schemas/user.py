@@ -12,3 +12,27 @@ class UserRead(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class UserPage(BaseModel):
+    items: list[UserRead]
+    next_cursor: int | None = None
+    total: int | None = None
+
+
+class UserImportError(BaseModel):
+    line: int
+    email: str | None = None
+    error: str
+
+
+class UserImportInvite(BaseModel):
+    email: EmailStr
+    invite_token: str
+
+
+class UserImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: list[UserImportError]
+    invites: list[UserImportInvite]
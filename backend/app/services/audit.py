@@ -1,13 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import SystemSessionLocal, run_db
 from app.models.audit_log import AuditLog
+from app.services.audit_coalescer import AuditCoalescer
+from app.services.audit_writer import AuditWriter
 
 
 PHI_EVENT = "phi_access"
 
+audit_writer = AuditWriter(
+    SystemSessionLocal,
+    mode=settings.audit_durability,
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_ms / 1000,
+)
+audit_coalescer = AuditCoalescer(
+    SystemSessionLocal,
+    window=settings.audit_coalesce_window_seconds,
+    excluded=settings.audit_non_coalescible_events,
+    max_keys=settings.audit_coalesce_max_keys,
+    fallback=audit_writer.submit,
+)
+
 
-def log_event(
-    db: Session,
+def build_event_row(
     *,
     agency_id: int | None,
     actor_user_id: int | None,
@@ -17,16 +39,32 @@ def log_event(
     message: str | None = None,
     ip_address: str | None = None,
     user_agent: str | None = None,
-) -> None:
-    entry = AuditLog(
-        agency_id=agency_id,
-        actor_user_id=actor_user_id,
-        event_type=event_type,
-        resource_type=resource_type,
-        resource_id=resource_id,
-        message=message,
-        ip_address=ip_address,
-        user_agent=user_agent,
-    )
-    db.add(entry)
+) -> dict:
+    return {
+        "agency_id": agency_id,
+        "actor_user_id": actor_user_id,
+        "event_type": event_type,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "message": message,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+async def log_event(db: Session | AsyncSession, **fields) -> None:
+    row = build_event_row(**fields)
+    if audit_coalescer.add(row) or await audit_writer.submit_async(row):
+        return
+    await run_db(db, write_event, row)
+
+
+def add_event(db: Session, **fields) -> None:
+    """Stage an audit row in the caller's transaction; it commits with the caller's work."""
+    db.execute(insert(AuditLog), [build_event_row(**fields)])
+
+
+def write_event(db: Session, row: dict) -> None:
+    db.add(AuditLog(**row))
     db.commit()
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from typing import Callable, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.services.audit_writer import UnwrittenAuditEvents
+
+logger = logging.getLogger(__name__)
+
+KEY_FIELDS = (
+    "agency_id",
+    "actor_user_id",
+    "event_type",
+    "resource_type",
+    "resource_id",
+    "message",
+    "ip_address",
+    "user_agent",
+)
+
+
+class AuditCoalescer:
+    """Merges identical audit events within ``window`` seconds into one row with a count.
+
+    The first event for a key opens a record stamped ``first_seen``; repeats
+    only bump ``last_seen`` and ``event_count``. Records are written once they
+    are ``window`` seconds old, and all of them on ``stop``. Event types in
+    ``excluded`` are never merged; neither is anything when the window is 0,
+    the coalescer is not running or ``max_keys`` records are already open, so
+    ``add`` returning False means the caller records the event itself.
+    Merged events are only held in memory until their record is written.
+
+    ``stop`` stops accepting events before the final flush. Records that
+    flush fails to write go to ``fallback`` (the audit writer's ``submit``),
+    and ``UnwrittenAuditEvents`` is raised for any it does not take.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        window: float,
+        excluded: Iterable[str] = (),
+        max_keys: int = 100000,
+        fallback: Callable[[dict], bool] | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window = window
+        self.excluded = frozenset(excluded)
+        self.max_keys = max_keys
+        self.fallback = fallback
+        self._open: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._accepting = False
+        self._stats = {"coalesced": 0, "records": 0, "flush_errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, row: dict) -> bool:
+        if row["event_type"] in self.excluded:
+            return False
+        key = tuple(row[field] for field in KEY_FIELDS)
+        with self._lock:
+            if not self._accepting:
+                return False
+            record = self._open.get(key)
+            if record is not None:
+                record["last_seen"] = row["created_at"]
+                record["event_count"] += 1
+                self._stats["coalesced"] += 1
+                return True
+            if len(self._open) >= self.max_keys:
+                return False
+            self._open[key] = {
+                **row,
+                "first_seen": row["created_at"],
+                "last_seen": row["created_at"],
+                "event_count": 1,
+                "_opened": time.monotonic(),
+            }
+            return True
+
+    def start(self) -> None:
+        if self.window <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-coalescer", daemon=True)
+        self._thread.start()
+        with self._lock:
+            self._accepting = True
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        with self._lock:
+            self._accepting = False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self.flush(final=True):
+            return
+        with self._lock:
+            rows = [self._row(record) for record in self._open.values()]
+            self._open.clear()
+        unwritten = []
+        for row in rows:
+            try:
+                handed_off = self.fallback is not None and self.fallback(row)
+            except Exception:
+                logger.exception("Handing a coalesced audit record to the fallback failed")
+                handed_off = False
+            if not handed_off:
+                logger.critical("Unwritten audit event: %r", row)
+                unwritten.append(row)
+        if unwritten:
+            raise UnwrittenAuditEvents(unwritten)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self._stats, "open": len(self._open)}
+
+    def flush(self, *, final: bool = False) -> bool:
+        """Write records whose window has closed (all of them if ``final``); False if the write failed."""
+        closes_before = time.monotonic() - self.window
+        with self._lock:
+            due = [key for key, record in self._open.items() if final or record["_opened"] <= closes_before]
+            if not due:
+                return True
+            records = [self._open.pop(key) for key in due]
+        rows = [self._row(record) for record in records]
+        try:
+            with self.session_factory() as session:
+                session.execute(insert(AuditLog), rows)
+                session.commit()
+        except Exception:
+            logger.exception("Writing %d coalesced audit records failed", len(rows))
+            with self._lock:
+                self._stats["flush_errors"] += 1
+                for key, record in zip(due, records):
+                    self._merge_back(key, record)
+            return False
+        with self._lock:
+            self._stats["records"] += len(rows)
+        return True
+
+    @staticmethod
+    def _row(record: dict) -> dict:
+        return {name: value for name, value in record.items() if name != "_opened"}
+
+    def _merge_back(self, key: tuple, record: dict) -> None:
+        newer = self._open.get(key)
+        if newer is not None:
+            record["last_seen"] = newer["last_seen"]
+            record["event_count"] += newer["event_count"]
+        self._open[key] = record
+
+    def _run(self) -> None:
+        interval = min(self.window, 1.0)
+        while not self._stop.wait(interval):
+            self.flush()
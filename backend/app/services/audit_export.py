@@ -0,0 +1,149 @@
+import csv
+from datetime import datetime
+import io
+import json
+import logging
+import time
+from typing import Callable, Iterator
+import zlib
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+from app.services.audit_query import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.agency_id,
+    AuditLog.actor_user_id,
+    AuditLog.event_type,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.message,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.created_at,
+    AuditLog.first_seen,
+    AuditLog.last_seen,
+    AuditLog.event_count,
+)
+COLUMN_NAMES = [column.key for column in EXPORT_COLUMNS]
+CURSOR_FIELD = "cursor"
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportStats:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.last_key: tuple[datetime, int] | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def resume_cursor(self) -> str | None:
+        return encode_cursor(*self.last_key) if self.last_key else None
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed
+        return {
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "seconds": elapsed,
+            "rows_per_second": self.rows / elapsed if elapsed else 0.0,
+            "resume_cursor": self.resume_cursor,
+        }
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _ndjson_chunk(rows) -> bytes:
+    lines = []
+    for row in rows:
+        record = dict(zip(COLUMN_NAMES, row))
+        record[CURSOR_FIELD] = encode_cursor(row.created_at, row.id)
+        lines.append(json.dumps(record, separators=(",", ":"), default=_json_default))
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (*(_csv_value(value) for value in row), encode_cursor(row.created_at, row.id)) for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow([*COLUMN_NAMES, CURSOR_FIELD])
+    return buffer.getvalue().encode()
+
+
+def iter_audit_export(
+    session_factory: Callable[[], Session],
+    filters: list,
+    *,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    cursor: str | None = None,
+    batch_size: int = 5000,
+    stats: ExportStats | None = None,
+) -> Iterator[bytes]:
+    """Stream audit rows matching ``filters`` in (created_at, id) order as encoded chunks.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time, so
+    memory stays flat whatever the range. Every NDJSON record and CSV row
+    carries a ``cursor`` field, and ``stats.resume_cursor`` points at the
+    last row of the last chunk the consumer took; passing either back as
+    ``cursor`` continues the export after that row. A resumed CSV export
+    has no header, so it can be appended to the interrupted file.
+    """
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    stats = stats or ExportStats()
+    encode = _ndjson_chunk if fmt == "ndjson" else _csv_chunk
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        stats.bytes += len(data)
+        return data
+
+    query = select(*EXPORT_COLUMNS).where(*filters)
+    if cursor is not None:
+        query = query.where(tuple_(AuditLog.created_at, AuditLog.id) > tuple_(*decode_cursor(cursor)))
+    query = query.order_by(AuditLog.created_at, AuditLog.id).execution_options(yield_per=batch_size)
+
+    try:
+        if fmt == "csv" and cursor is None:
+            yield emit(_csv_header())
+        with session_factory() as session:
+            for rows in session.execute(query).partitions():
+                stats.rows += len(rows)
+                chunk = emit(encode(rows))
+                if chunk:
+                    yield chunk
+                stats.last_key = (rows[-1].created_at, rows[-1].id)
+        if compressor is not None:
+            tail = compressor.flush()
+            stats.bytes += len(tail)
+            yield tail
+    finally:
+        logger.info("Audit export finished: %s", stats.as_dict())
@@ -0,0 +1,39 @@
+import base64
+from datetime import datetime
+
+from app.models.audit_log import AuditLog
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(created_at), int(row_id)
+
+
+def audit_filters(
+    agency_id: int,
+    *,
+    event_type: str | None = None,
+    actor_user_id: int | None = None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list:
+    filters = [AuditLog.agency_id == agency_id]
+    if event_type is not None:
+        filters.append(AuditLog.event_type == event_type)
+    if actor_user_id is not None:
+        filters.append(AuditLog.actor_user_id == actor_user_id)
+    if resource_type is not None:
+        filters.append(AuditLog.resource_type == resource_type)
+    if resource_id is not None:
+        filters.append(AuditLog.resource_id == resource_id)
+    if start is not None:
+        filters.append(AuditLog.created_at >= start)
+    if end is not None:
+        filters.append(AuditLog.created_at < end)
+    return filters
@@ -0,0 +1,260 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+SYNC = "sync"
+GROUP_COMMIT = "group"
+ASYNC = "async"
+DURABILITY_MODES = (SYNC, GROUP_COMMIT, ASYNC)
+
+
+class UnwrittenAuditEvents(RuntimeError):
+    """Raised by ``AuditWriter.stop`` when pending rows could not be written; they are on ``rows``."""
+
+    def __init__(self, rows: list[dict]) -> None:
+        super().__init__(f"{len(rows)} audit events could not be written on shutdown")
+        self.rows = rows
+
+
+class AuditWriter:
+    """Buffers audit rows in a bounded queue and writes them as multi-row INSERTs.
+
+    ``group`` mode blocks the caller until its row is committed with the rest of
+    the batch; ``async`` mode returns immediately. In both modes the caller falls
+    back to a synchronous write when the queue is full, the writer is not running
+    or (for ``group``) the batch commit fails, so no event is dropped.
+
+    ``stop`` stops accepting rows before it drains: anything the writer
+    thread has not committed within ``timeout`` is written on the calling
+    thread, and ``UnwrittenAuditEvents`` is raised if that fails too or if
+    the thread's own batch is still not committed after another ``timeout``.
+    ``stop`` blocks, so async callers run it in a worker thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        mode: str = SYNC,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown audit durability mode: {mode}")
+        self.session_factory = session_factory
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._retry: deque = deque()
+        self._in_flight: list = []
+        self._thread: threading.Thread | None = None
+        self._accepting = False
+        self._stopping = threading.Event()
+        self._halt = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "fallback_writes": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.mode == SYNC or self.running:
+            return
+        self._stopping.clear()
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        with self._lock:
+            self._accepting = True
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        if self._thread is None:
+            return
+        with self._lock:
+            self._accepting = False
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(
+                "Audit writer did not drain within %ss; writing %d pending events on shutdown",
+                timeout,
+                self.queue_depth(),
+            )
+            self._halt.set()
+            self._thread.join(timeout)
+        stuck = self._thread.is_alive()
+        self._thread = None
+        self._write_remaining()
+        rows = [row for row, waiter in self._in_flight if waiter is None] if stuck else []
+        for row in rows:
+            logger.critical("Audit event possibly unwritten, writer stuck in its flush: %r", row)
+        if rows:
+            raise UnwrittenAuditEvents(rows)
+
+    def submit(self, row: dict) -> bool:
+        """Queue ``row`` for writing. Returns False if the caller must write it itself."""
+        queued, waiter = self._enqueue(row)
+        if not queued or waiter is None:
+            return queued
+        try:
+            waiter.result()
+        except Exception:
+            self._record(fallback_writes=1)
+            return False
+        return True
+
+    async def submit_async(self, row: dict) -> bool:
+        queued, waiter = self._enqueue(row)
+        if not queued or waiter is None:
+            return queued
+        try:
+            await asyncio.wrap_future(waiter)
+        except Exception:
+            self._record(fallback_writes=1)
+            return False
+        return True
+
+    def _enqueue(self, row: dict) -> tuple[bool, Future | None]:
+        if self.mode == SYNC or not self.running:
+            return False, None
+        waiter: Future | None = Future() if self.mode == GROUP_COMMIT else None
+        with self._lock:
+            if not self._accepting:
+                return False, None
+            try:
+                self._queue.put_nowait((row, waiter))
+            except queue.Full:
+                self._stats["fallback_writes"] += 1
+                return False, None
+            self._stats["enqueued"] += 1
+        return True, waiter
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["mode"] = self.mode
+        stats["queue_depth"] = self.queue_depth()
+        stats["queue_capacity"] = self._queue.maxsize
+        stats["avg_flush_ms"] = stats["total_flush_ms"] / stats["flushes"] if stats["flushes"] else 0.0
+        return stats
+
+    def _record(self, **increments) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _run(self) -> None:
+        while not self._halt.is_set():
+            stopping = self._stopping.is_set()
+            batch = list(self._retry)
+            self._retry.clear()
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 and not stopping else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            if not batch:
+                if stopping:
+                    return
+                continue
+            self._in_flight = batch
+            flushed = self._flush(batch)
+            self._in_flight = []
+            if not flushed and stopping:
+                return
+
+    def _flush(self, batch: list) -> bool:
+        """Commit ``batch``; on failure fail its waiters, keep the rest for a retry and return False."""
+        started = time.perf_counter()
+        try:
+            self._insert([row for row, _ in batch])
+        except Exception as exc:
+            self._record(flush_errors=1)
+            logger.exception("Audit batch of %d events failed to commit", len(batch))
+            for _, waiter in batch:
+                if waiter is not None:
+                    waiter.set_exception(exc)
+            self._retry.extend((row, None) for row, waiter in batch if waiter is None)
+            self._stopping.wait(self.retry_backoff)
+            return False
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["written"] += len(batch)
+            self._stats["flushes"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_flush_ms"] = elapsed_ms
+            self._stats["total_flush_ms"] += elapsed_ms
+            self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+        for _, waiter in batch:
+            if waiter is not None:
+                waiter.set_result(None)
+        return True
+
+    def _insert(self, rows: list[dict]) -> None:
+        with self.session_factory() as session:
+            session.execute(insert(AuditLog), rows)
+            session.commit()
+
+    def _write_remaining(self) -> None:
+        """Write retained and still-queued rows on the calling thread once the writer thread has exited."""
+        pending = list(self._retry)
+        self._retry.clear()
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not pending:
+            return
+        try:
+            self._insert([row for row, _ in pending])
+        except Exception as exc:
+            self._record(flush_errors=1)
+            unwritten = []
+            for row, waiter in pending:
+                if waiter is not None:
+                    waiter.set_exception(exc)
+                else:
+                    logger.critical("Unwritten audit event: %r", row)
+                    unwritten.append(row)
+            if unwritten:
+                raise UnwrittenAuditEvents(unwritten) from exc
+            return
+        self._record(written=len(pending))
+        for _, waiter in pending:
+            if waiter is not None:
+                waiter.set_result(None)
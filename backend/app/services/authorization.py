@@ -0,0 +1,134 @@
+import logging
+import threading
+from typing import Callable, Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.permission import Permission, RolePermission
+from app.models.role import Role
+
+logger = logging.getLogger(__name__)
+
+PERMISSIONS = (
+    "phi:read",
+    "users:read",
+    "users:write",
+    "roles:read",
+    "roles:assign",
+    "audit:read",
+    "audit:export",
+)
+DEFAULT_ROLE_PERMISSIONS = {
+    "admin": PERMISSIONS,
+    "clinician": ("phi:read",),
+}
+
+
+class AuthorizationIndex:
+    """Role → permission mapping compiled to one bitmask per role id.
+
+    Each permission name gets a bit; checks OR the masks of a principal's
+    role ids and test the bit without touching the database. The compiled
+    state is replaced wholesale on ``load`` so readers never see a partial
+    index; it reloads after any committed change to roles or permissions and,
+    with ``start``, periodically to pick up changes made by other processes.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        self.session_factory = session_factory
+        self._state: tuple[dict[str, int], dict[int, int], dict[str, int]] = ({}, {}, {})
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def load(self) -> None:
+        with self.session_factory() as db:
+            roles = db.execute(select(Role.id, Role.name)).all()
+            names = db.scalars(select(Permission.name).order_by(Permission.id)).all()
+            grants = db.execute(
+                select(RolePermission.role_id, Permission.name).join(
+                    Permission, Permission.id == RolePermission.permission_id
+                )
+            ).all()
+        bits = {name: 1 << position for position, name in enumerate(names)}
+        role_masks = {role_id: 0 for role_id, _ in roles}
+        for role_id, name in grants:
+            role_masks[role_id] = role_masks.get(role_id, 0) | bits[name]
+        self._state = (bits, role_masks, {name: role_id for role_id, name in roles})
+
+    def allows(self, role_ids: Iterable[int], permission: str) -> bool:
+        bits, role_masks, _ = self._state
+        bit = bits.get(permission, 0)
+        if not bit:
+            return False
+        return any(role_masks.get(role_id, 0) & bit for role_id in role_ids)
+
+    def permissions(self, role_ids: Iterable[int]) -> set[str]:
+        bits, role_masks, _ = self._state
+        mask = 0
+        for role_id in role_ids:
+            mask |= role_masks.get(role_id, 0)
+        return {name for name, bit in bits.items() if mask & bit}
+
+    def role_id(self, name: str) -> int | None:
+        return self._state[2].get(name)
+
+    def start(self, interval: float) -> None:
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="authorization-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.load()
+            except Exception:
+                logger.exception("Authorization index refresh failed")
+
+
+def ensure_default_permissions(db: Session) -> None:
+    """Create the permission catalog and grant the default permissions to existing roles."""
+    existing = set(db.scalars(select(Permission.name)))
+    db.add_all(Permission(name=name) for name in PERMISSIONS if name not in existing)
+    db.flush()
+    permission_ids = {name: permission_id for permission_id, name in db.execute(select(Permission.id, Permission.name))}
+    role_ids = {name: role_id for role_id, name in db.execute(select(Role.id, Role.name))}
+    granted = set(db.execute(select(RolePermission.role_id, RolePermission.permission_id)).tuples())
+    for role_name, names in DEFAULT_ROLE_PERMISSIONS.items():
+        if role_name not in role_ids:
+            continue
+        for name in names:
+            key = (role_ids[role_name], permission_ids[name])
+            if key not in granted:
+                db.add(RolePermission(role_id=key[0], permission_id=key[1]))
+    db.commit()
+
+
+authorization_index = AuthorizationIndex(SessionLocal)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_authorization_changes(session: Session, flush_context) -> None:
+    if any(isinstance(obj, (Role, Permission, RolePermission)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["authorization_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _reload_authorization_index(session: Session) -> None:
+    if session.info.pop("authorization_changed", False):
+        authorization_index.load()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_authorization_changes(session: Session) -> None:
+    session.info.pop("authorization_changed", None)
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import signal
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.instrumentation import pool_status
+from app.db.session import async_engine, engine
+from app.services.audit import audit_writer
+from app.services.audit_writer import AuditWriter
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessCheck:
+    """Readiness of this worker: DB reachable, pool headroom, audit backlog, not draining.
+
+    The database and pool checked are the ones requests use: ``async_engine``
+    when the app runs in async mode, ``engine`` otherwise. Results are cached
+    for ``ttl`` seconds and only one caller refreshes an expired result while
+    the others wait for it, so however often probes arrive the database sees
+    at most one ``SELECT 1`` per interval. The ``SELECT 1`` counts as failed
+    after ``db_timeout`` seconds, so an exhausted pool reads as not ready
+    instead of hanging the probe.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        audit_writer: AuditWriter,
+        *,
+        async_engine: AsyncEngine | None = None,
+        ttl: float,
+        db_timeout: float,
+        max_pool_utilization: float,
+        max_audit_backlog: float,
+    ) -> None:
+        self.engine = engine
+        self.async_engine = async_engine
+        self.audit_writer = audit_writer
+        self.ttl = ttl
+        self.db_timeout = db_timeout
+        self.max_pool_utilization = max_pool_utilization
+        self.max_audit_backlog = max_audit_backlog
+        self.draining = False
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._cached: tuple[float, dict] | None = None
+
+    def drain(self) -> None:
+        if not self.draining:
+            logger.info("Draining: readiness now fails")
+        self.draining = True
+
+    def cached(self) -> dict | None:
+        cached = self._cached
+        if cached is None or cached[0] < time.monotonic():
+            return None
+        return self._with_drain(cached[1])
+
+    @property
+    def request_engine(self) -> Engine:
+        return self.async_engine.sync_engine if self.async_engine is not None else self.engine
+
+    async def check(self) -> dict:
+        result = self.cached()
+        if result is not None:
+            return result
+        async with self._refresh_lock():
+            result = self.cached()
+            if result is not None:
+                return result
+            result = await self._run_checks()
+            self._cached = (time.monotonic() + self.ttl, result)
+        return self._with_drain(result)
+
+    def _refresh_lock(self) -> asyncio.Lock:
+        # Created in the running loop rather than at import, and again if the app moves to another loop.
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _with_drain(self, result: dict) -> dict:
+        if not self.draining:
+            return result
+        return {**result, "status": "unavailable", "checks": {**result["checks"], "draining": {"ok": False}}}
+
+    async def _run_checks(self) -> dict:
+        checks = {"database": await self._check_database(), "pool": self._check_pool(), "audit": self._check_audit()}
+        ready = all(check["ok"] for check in checks.values())
+        return {"status": "ok" if ready else "unavailable", "checks": checks}
+
+    async def _check_database(self) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._select_one(), self.db_timeout)
+        except Exception as exc:
+            logger.warning("Readiness database check failed: %s", exc)
+            return {"ok": False, "error": type(exc).__name__}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    async def _select_one(self) -> None:
+        if self.async_engine is not None:
+            async with self.async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        else:
+            # A timed-out ping keeps its worker thread until the pool's own checkout timeout.
+            await run_in_threadpool(self._ping)
+
+    def _ping(self) -> None:
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    def _check_pool(self) -> dict:
+        engine = self.request_engine
+        status = pool_status(engine)
+        if "size" not in status:
+            return {"ok": True, **status}
+        capacity = status["size"] + engine.pool._max_overflow
+        utilization = status["checked_out"] / capacity if capacity > 0 else 0.0
+        return {"ok": utilization < self.max_pool_utilization, "utilization": round(utilization, 3), **status}
+
+    def _check_audit(self) -> dict:
+        metrics = self.audit_writer.metrics()
+        capacity = metrics["queue_capacity"]
+        backlog = metrics["queue_depth"] / capacity if capacity > 0 else 0.0
+        ok = backlog < self.max_audit_backlog and (metrics["mode"] == "sync" or self.audit_writer.running)
+        return {"ok": ok, "mode": metrics["mode"], "queue_depth": metrics["queue_depth"], "backlog": round(backlog, 3)}
+
+
+def install_drain_handler(check: ReadinessCheck, drain_seconds: float) -> None:
+    """Make SIGTERM fail readiness first and hand over to the server's shutdown ``drain_seconds`` later.
+
+    The delay gives load balancers time to stop routing here; the server's
+    own handler then stops accepting connections, waits for in-flight
+    requests and runs the lifespan shutdown, which flushes the audit writer.
+    A second SIGTERM shuts down immediately.
+    """
+    if drain_seconds <= 0 or threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+
+    def _on_sigterm(signum, frame) -> None:
+        if check.draining:
+            previous(signum, frame)
+            return
+        check.drain()
+        timer = threading.Timer(drain_seconds, previous, args=(signum, frame))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+readiness = ReadinessCheck(
+    engine,
+    audit_writer,
+    async_engine=async_engine,
+    ttl=settings.health_cache_seconds,
+    db_timeout=settings.health_db_timeout_seconds,
+    max_pool_utilization=settings.health_max_pool_utilization,
+    max_audit_backlog=settings.health_max_audit_backlog,
+)
@@ -0,0 +1,95 @@
+from app.services.jwt_keys import JwtKeys
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class JoseBackend:
+    name = "jose"
+
+    def __init__(self, keys: JwtKeys) -> None:
+        if keys.algorithm == "EdDSA":
+            raise ValueError("python-jose does not support EdDSA; use JWT_BACKEND=pyjwt")
+        from jose import JWTError, jwk
+        from jose import jwt as jose_jwt
+
+        self.keys = keys
+        self.algorithm = keys.algorithm
+        self._jwt = jose_jwt
+        self._jwk = jwk
+        self._error = JWTError
+        self._headers = {"kid": keys.active_kid} if keys.active_kid else None
+        self._verify_keys = {kid: jwk.construct(key, keys.algorithm) for kid, key in keys.verification_keys.items()}
+
+    def encode(self, payload: dict) -> str:
+        return self._jwt.encode(payload, self.keys.signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        try:
+            key = _select_key(self._verify_keys, self._jwt.get_unverified_header(token).get("kid"))
+            return self._jwt.decode(token, key, algorithms=[self.algorithm])
+        except self._error as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+    def jwks(self) -> list[dict]:
+        if not self.keys.asymmetric:
+            return []
+        return [
+            {**self._jwk.construct(key, self.algorithm).to_dict(), "kid": kid, "use": "sig"}
+            for kid, key in self.keys.verification_keys.items()
+        ]
+
+
+class PyJWTBackend:
+    name = "pyjwt"
+
+    def __init__(self, keys: JwtKeys) -> None:
+        import jwt
+
+        self.keys = keys
+        self.algorithm = keys.algorithm
+        self._jwt = jwt.PyJWT()
+        self._error = jwt.PyJWTError
+        self._get_unverified_header = jwt.get_unverified_header
+        self._algorithm = jwt.get_algorithm_by_name(keys.algorithm)
+        self._headers = {"kid": keys.active_kid} if keys.active_kid else None
+        self._signing_key = self._algorithm.prepare_key(keys.signing_key)
+        self._verify_keys = {kid: self._algorithm.prepare_key(key) for kid, key in keys.verification_keys.items()}
+
+    def encode(self, payload: dict) -> str:
+        return self._jwt.encode(payload, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        try:
+            key = _select_key(self._verify_keys, self._get_unverified_header(token).get("kid"))
+            return self._jwt.decode(token, key, algorithms=[self.algorithm])
+        except self._error as exc:
+            raise InvalidTokenError(str(exc)) from exc
+
+    def jwks(self) -> list[dict]:
+        if not self.keys.asymmetric:
+            return []
+        return [
+            {**self._algorithm.to_jwk(key, as_dict=True), "kid": kid, "alg": self.algorithm, "use": "sig"}
+            for kid, key in self._verify_keys.items()
+        ]
+
+
+def _select_key(keys: dict, kid: str | None):
+    if kid in keys:
+        return keys[kid]
+    if kid is None and len(keys) == 1:
+        return next(iter(keys.values()))
+    raise InvalidTokenError("Unknown signing key")
+
+
+JWT_BACKENDS = {JoseBackend.name: JoseBackend, PyJWTBackend.name: PyJWTBackend}
+
+
+def build_jwt_backend(name: str, keys: JwtKeys) -> JoseBackend | PyJWTBackend:
+    try:
+        backend = JWT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {name}") from None
+    return backend(keys)
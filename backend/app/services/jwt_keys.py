@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+PRIVATE_SUFFIX = ".pem"
+PUBLIC_SUFFIX = ".pub.pem"
+
+
+@dataclass(frozen=True)
+class JwtKeys:
+    """Key material for signing and verifying tokens.
+
+    For HMAC algorithms the shared secret is both the signing and the only
+    verification key and has no key id. For asymmetric algorithms the active
+    key signs and every loaded key, active or retired, verifies by ``kid``.
+    """
+
+    algorithm: str
+    active_kid: str | None
+    signing_key: str
+    verification_keys: dict[str | None, str]
+
+    @property
+    def asymmetric(self) -> bool:
+        return not self.algorithm.startswith("HS")
+
+
+def _public_pem(private_pem: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+
+    private_key = serialization.load_pem_private_key(private_pem.encode(), password=None)
+    return private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+
+def load_jwt_keys(algorithm: str, secret: str, keys_dir: str | None, active_kid: str | None) -> JwtKeys:
+    """Load keys for ``algorithm``.
+
+    Asymmetric keys are read from ``keys_dir``: ``<kid>.pem`` holds a private
+    key and ``<kid>.pub.pem`` a public key kept only so tokens signed by a
+    retired key stay verifiable until they expire. ``active_kid`` names the
+    private key used for signing.
+    """
+    if algorithm.startswith("HS"):
+        return JwtKeys(algorithm, None, secret, {None: secret})
+
+    if not keys_dir or not active_kid:
+        raise ValueError(f"{algorithm} requires JWT_KEYS_DIR and JWT_ACTIVE_KID")
+
+    private_keys: dict[str, str] = {}
+    public_keys: dict[str | None, str] = {}
+    for path in sorted(Path(keys_dir).glob(f"*{PRIVATE_SUFFIX}")):
+        if path.name.endswith(PUBLIC_SUFFIX):
+            public_keys[path.name[: -len(PUBLIC_SUFFIX)]] = path.read_text()
+        else:
+            kid = path.name[: -len(PRIVATE_SUFFIX)]
+            private_keys[kid] = path.read_text()
+            public_keys[kid] = _public_pem(private_keys[kid])
+
+    if active_kid not in private_keys:
+        raise ValueError(f"No private key {active_kid}{PRIVATE_SUFFIX} in {keys_dir}")
+    return JwtKeys(algorithm, active_kid, private_keys[active_kid], public_keys)
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import time
+from typing import Any, Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+)
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool so it never holds the GIL of the API process.
+
+    At most ``max_pending`` operations may be queued or running; beyond that
+    callers get ``HashPoolSaturated`` instead of waiting. With ``workers=0`` the
+    work runs in the threadpool as before.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._peak_pending = 0
+        self._rejected = 0
+        self._latency = LatencyStats()
+
+    def start(self) -> None:
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def warm(self) -> None:
+        """Spawn every worker and load the bcrypt backend in each before the first login needs it."""
+        await asyncio.gather(*(self.hash("warm-up") for _ in range(max(self.workers, 1))))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self._submit(verify_and_update, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hash ``passwords`` at most ``workers`` at a time, so a bulk job leaves room in the pool for logins."""
+        step = max(self.workers, 1)
+        hashes: list[str] = []
+        for start in range(0, len(passwords), step):
+            hashes += await asyncio.gather(*(self.hash(password) for password in passwords[start : start + step]))
+        return hashes
+
+    async def _submit(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HashPoolSaturated()
+        self.start()
+        self._pending += 1
+        self._peak_pending = max(self._peak_pending, self._pending)
+        started = time.perf_counter()
+        try:
+            if self._executor is None:
+                return await run_in_threadpool(fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+            self._latency.observe((time.perf_counter() - started) * 1000)
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "peak_pending": self._peak_pending,
+            "utilization": min(self._pending, self.workers) / self.workers if self.workers else 0.0,
+            "rejected": self._rejected,
+            "latency": self._latency.snapshot(),
+        }
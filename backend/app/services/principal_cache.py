@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.db.replicas import PRIMARY_OPTION
+from app.models.user import User
+from app.models.user_role import UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    agency_id: int
+    email: str
+    is_active: bool
+    roles: frozenset[str]
+    role_ids: frozenset[int]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            agency_id=user.agency_id,
+            email=user.email,
+            is_active=user.is_active,
+            roles=frozenset(assignment.role.name for assignment in user.roles),
+            role_ids=frozenset(assignment.role_id for assignment in user.roles),
+        )
+
+
+class PrincipalCache:
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def fetch(self, db: Session, user_id: int) -> Principal | None:
+        """Load and cache ``user_id``'s principal, always from the primary.
+
+        A replica could lag behind a role change or deactivation and put the
+        stale principal back into the cache for the whole TTL.
+        """
+        user = (
+            db.query(User)
+            .options(joinedload(User.roles).joinedload(UserRole.role))
+            .filter(User.id == user_id)
+            .execution_options(**{PRIMARY_OPTION: True})
+            .first()
+        )
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        self.put(principal)
+        return principal
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    max_entries=settings.principal_cache_size,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_principal_changes(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("principal_cache_invalidations", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+        elif isinstance(obj, UserRole) and obj.user_id is not None:
+            changed.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session: Session) -> None:
+    changed = session.info.pop("principal_cache_invalidations", None)
+    if changed:
+        principal_cache.invalidate(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session) -> None:
+    session.info.pop("principal_cache_invalidations", None)
@@ -0,0 +1,173 @@
+from collections import OrderedDict
+import math
+import threading
+import time
+from typing import Callable, Protocol
+
+from app.core.config import settings
+
+
+class RateLimitStore(Protocol):
+    """Counter store shared by every process that enforces the same limits.
+
+    The operations map directly onto INCR/EXPIRE, GET, DEL and SET NX EX of a
+    shared cache such as Redis or memcached; ``InMemoryRateLimitStore``
+    implements them for a single process.
+    """
+
+    def incr(self, key: str, ttl: float) -> int: ...
+
+    def get(self, key: str) -> int: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def add(self, key: str, ttl: float) -> bool: ...
+
+
+class InMemoryRateLimitStore:
+    def __init__(self, *, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float) -> list | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _insert(self, key: str, entry: list) -> None:
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def incr(self, key: str, ttl: float) -> int:
+        now = self.clock()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None:
+                entry = [now + ttl, 0]
+                self._insert(key, entry)
+            else:
+                self._entries.move_to_end(key)
+            entry[1] += 1
+            return entry[1]
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key, self.clock())
+            return entry[1] if entry is not None else 0
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def add(self, key: str, ttl: float) -> bool:
+        now = self.clock()
+        with self._lock:
+            if self._live(key, now) is not None:
+                return False
+            self._insert(key, [now + ttl, 1])
+            return True
+
+
+class LoginRateLimiter:
+    """Sliding-window limit on failed logins per client IP and per email.
+
+    Failures are counted in fixed windows and the previous window is weighted
+    by how much of it still overlaps the sliding window, so each key costs two
+    counters however many attempts it sees. A key at its limit is refused
+    until the estimate drops, before any lookup or hash is spent on it.
+    ``record_failure`` reports a key as newly locked only the first time it
+    crosses the limit in a window, so lockouts are recorded once.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        *,
+        window_seconds: float,
+        max_failures_per_ip: int,
+        max_failures_per_email: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.window = window_seconds
+        self.limits = {"ip": max_failures_per_ip, "email": max_failures_per_email}
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stats = {"rejected": 0, "lockouts": 0}
+
+    def _keys(self, ip: str | None, email: str) -> list[tuple[str, str]]:
+        keys = [("email", email.lower())]
+        if ip:
+            keys.append(("ip", ip))
+        return keys
+
+    def _estimate(self, kind: str, value: str, now: float) -> tuple[float, float]:
+        bucket = math.floor(now / self.window)
+        elapsed = now - bucket * self.window
+        current = self.store.get(f"login:{kind}:{value}:{bucket}")
+        previous = self.store.get(f"login:{kind}:{value}:{bucket - 1}")
+        return current + previous * (1 - elapsed / self.window), elapsed
+
+    def retry_after(self, ip: str | None, email: str) -> int | None:
+        """Seconds the caller must wait, or ``None`` if the attempt may proceed."""
+        if self.window <= 0:
+            return None
+        now = self.clock()
+        for kind, value in self._keys(ip, email):
+            estimate, elapsed = self._estimate(kind, value, now)
+            if estimate >= self.limits[kind]:
+                with self._lock:
+                    self._stats["rejected"] += 1
+                return max(1, math.ceil(self.window - elapsed))
+        return None
+
+    def record_failure(self, ip: str | None, email: str) -> list[str]:
+        """Count a failed attempt; returns the keys ("ip", "email") that just became locked."""
+        if self.window <= 0:
+            return []
+        now = self.clock()
+        bucket = math.floor(now / self.window)
+        locked = []
+        for kind, value in self._keys(ip, email):
+            self.store.incr(f"login:{kind}:{value}:{bucket}", self.window * 2)
+            estimate, _ = self._estimate(kind, value, now)
+            if estimate >= self.limits[kind] and self.store.add(f"lockout:{kind}:{value}:{bucket}", self.window * 2):
+                locked.append(kind)
+        if locked:
+            with self._lock:
+                self._stats["lockouts"] += len(locked)
+        return locked
+
+    def record_success(self, email: str) -> None:
+        bucket = math.floor(self.clock() / self.window) if self.window > 0 else 0
+        value = email.lower()
+        self.store.delete(f"login:email:{value}:{bucket}", f"login:email:{value}:{bucket - 1}")
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+RATE_LIMIT_STORES: dict[str, Callable[..., RateLimitStore]] = {"memory": InMemoryRateLimitStore}
+
+
+def build_rate_limit_store(name: str, *, max_entries: int) -> RateLimitStore:
+    try:
+        store = RATE_LIMIT_STORES[name]
+    except KeyError:
+        raise ValueError(f"Unknown rate limit store: {name}") from None
+    return store(max_entries=max_entries)
+
+
+login_rate_limiter = LoginRateLimiter(
+    build_rate_limit_store(settings.login_rate_limit_store, max_entries=settings.login_rate_limit_max_keys),
+    window_seconds=settings.login_failure_window_seconds,
+    max_failures_per_ip=settings.login_max_failures_per_ip,
+    max_failures_per_email=settings.login_max_failures_per_email,
+)
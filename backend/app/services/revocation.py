@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationIndex:
+    """Revoked access-token ids held in memory until the tokens expire.
+
+    ``load`` reads every unexpired row of ``revoked_tokens``; with ``start``
+    the index polls for rows revoked since its previous poll, so a logout on
+    any worker takes effect everywhere within one interval. ``overlap`` widens
+    each poll to cover transactions that committed late and clock skew between
+    workers. ``is_revoked`` is a dict lookup; nothing is queried per request.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], *, overlap: timedelta = timedelta(seconds=30)) -> None:
+        self.session_factory = session_factory
+        self.overlap = overlap
+        self._entries: dict[str, float] = {}
+        self._since: datetime | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"polls": 0, "poll_errors": 0}
+
+    def is_revoked(self, jti: str | None) -> bool:
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[jti] = expires_at
+
+    def load(self) -> None:
+        self._fetch(None)
+
+    def poll(self) -> None:
+        since = self._since
+        self._fetch(since - self.overlap if since is not None else None)
+        with self._lock:
+            self._stats["polls"] += 1
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> None:
+        """Persist the revocation of ``jti`` and apply it to this process at once."""
+        db.add(RevokedToken(jti=jti, expires_at=expires_at, revoked_at=datetime.now(timezone.utc)))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        self.add(jti, _timestamp(expires_at))
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+    def start(self, interval: float) -> None:
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="revocation-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _fetch(self, revoked_since: datetime | None) -> None:
+        started = datetime.now(timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > started)
+        if revoked_since is not None:
+            query = query.where(RevokedToken.revoked_at >= revoked_since)
+        with self.session_factory() as db:
+            rows = db.execute(query).all()
+        now = time.time()
+        with self._lock:
+            entries = {jti: expires_at for jti, expires_at in self._entries.items() if expires_at > now}
+            entries.update((jti, _timestamp(expires_at)) for jti, expires_at in rows)
+            self._entries = entries
+            self._since = started
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                with self._lock:
+                    self._stats["poll_errors"] += 1
+                logger.exception("Revocation index poll failed")
+
+
+revocation_index = RevocationIndex(SessionLocal)
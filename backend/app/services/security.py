@@ -1,13 +1,76 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 import hashlib
+import threading
+import time
 import uuid
 
-from jose import jwt
-from passlib.context import CryptContext
-
 from app.core.config import settings
+from app.services.jwt_backends import InvalidTokenError, build_jwt_backend
+from app.services.jwt_keys import load_jwt_keys
+from app.services.password_hashing import PasswordHasher, pwd_context
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+jwt_keys = load_jwt_keys(
+    settings.jwt_algorithm,
+    settings.jwt_secret_key,
+    settings.jwt_keys_dir,
+    settings.jwt_active_kid,
+)
+jwt_backend = build_jwt_backend(settings.jwt_backend, jwt_keys)
+
+
+class TokenCache:
+    """Bounded LRU of verified token claims; an entry never outlives the token's ``exp``."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[token] = (expires_at, claims)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.jwt_decode_cache_size)
+
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def decode_token(token: str, *, cache: bool = False) -> dict:
+    """Verify ``token`` and return its claims, raising InvalidTokenError if it is not valid."""
+    if cache:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+    claims = jwt_backend.decode(token)
+    if cache:
+        token_cache.put(token, claims)
+    return claims
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,7 +90,7 @@ def create_access_token(subject: str, expires_delta: timedelta) -> str:
         "jti": str(uuid.uuid4()),
         "type": "access",
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt_backend.encode(payload)
 
 
 def create_refresh_token(subject: str, expires_delta: timedelta) -> str:
@@ -39,7 +102,7 @@ def create_refresh_token(subject: str, expires_delta: timedelta) -> str:
         "jti": str(uuid.uuid4()),
         "type": "refresh",
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt_backend.encode(payload)
 
 
 def hash_refresh_token(token: str) -> str:
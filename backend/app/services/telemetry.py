@@ -0,0 +1,307 @@
+from contextlib import contextmanager
+import fcntl
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Iterator
+import uuid
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, LabeledHistogram
+from app.db.instrumentation import pool_stats, pool_status, query_stats
+from app.db.session import async_engine, engine, read_replicas
+from app.services.audit import audit_coalescer, audit_writer
+from app.services.rate_limit import login_rate_limiter
+from app.services.revocation import revocation_index
+from app.services.security import password_hasher
+from app.services.token_reaper import token_reaper
+
+logger = logging.getLogger(__name__)
+
+RETIRED = "retired"
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+request_duration = LabeledHistogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by route template.",
+    REQUEST_BUCKETS,
+    labels=("method", "route", "status"),
+)
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+logins = Counter("auth_logins_total", "Login attempts by result.", labels=("result",))
+token_refreshes = Counter("auth_token_refreshes_total", "Refresh token exchanges by result.", labels=("result",))
+
+
+def _family(name: str, kind: str, description: str, samples: list) -> dict:
+    return {"name": name, "type": kind, "help": description, "samples": samples}
+
+
+def _counter_family(counter: Counter, kind: str = "counter") -> dict:
+    return _family(
+        counter.name,
+        kind,
+        counter.description,
+        [["", dict(zip(counter.labels, key)), value] for key, value in counter.values().items()],
+    )
+
+
+def _histogram_samples(labels: dict, bounds, cumulative: list[int], total: float) -> list:
+    samples = [["_bucket", {**labels, "le": repr(float(bound))}, count] for bound, count in zip(bounds, cumulative)]
+    samples.append(["_bucket", {**labels, "le": "+Inf"}, cumulative[-1]])
+    samples.append(["_sum", labels, total])
+    samples.append(["_count", labels, cumulative[-1]])
+    return samples
+
+
+def _labeled_histogram_family(histogram: LabeledHistogram) -> dict:
+    samples = []
+    for key, (cumulative, total) in histogram.values().items():
+        samples += _histogram_samples(dict(zip(histogram.labels, key)), histogram.buckets, cumulative, total)
+    return _family(histogram.name, "histogram", histogram.description, samples)
+
+
+def _value(name: str, kind: str, description: str, value: float) -> dict:
+    return _family(name, kind, description, [["", {}, value]])
+
+
+def _gauges(prefix: str, description: str, values: dict) -> list[dict]:
+    return [_value(f"{prefix}_{key}", "gauge", f"{description} {key}.", value) for key, value in values.items()]
+
+
+def _pool_gauges() -> list[dict]:
+    pools = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return [
+        _family(
+            f"db_pool_{key}",
+            "gauge",
+            f"Database connection pool {key}.",
+            [["", {"engine": name}, status[key]] for name, status in pools.items() if key in status],
+        )
+        for key in ("size", "checked_in", "checked_out", "overflow")
+    ]
+
+
+def collect() -> list[dict]:
+    """Snapshot every metric of this process as families of ``[suffix, labels, value]`` samples."""
+    hasher = password_hasher.metrics()
+    audit = audit_writer.metrics()
+    coalescer = audit_coalescer.metrics()
+    limiter = login_rate_limiter.metrics()
+    revocations = revocation_index.metrics()
+    replicas = read_replicas.metrics()
+    reaper = token_reaper.metrics()
+
+    return [
+        _labeled_histogram_family(request_duration),
+        _counter_family(requests_in_flight, "gauge"),
+        _counter_family(logins),
+        _counter_family(token_refreshes),
+        *_pool_gauges(),
+        _counter_family(pool_stats.checkouts),
+        _counter_family(pool_stats.overflow_checkouts),
+        _counter_family(pool_stats.disconnects),
+        _counter_family(pool_stats.checkout_wait),
+        _labeled_histogram_family(query_stats.statement_duration),
+        _labeled_histogram_family(query_stats.request_queries),
+        _labeled_histogram_family(query_stats.request_duration),
+        _counter_family(query_stats.slow_queries),
+        _family(
+            "db_replica_routed_reads_total",
+            "counter",
+            "Read-replica eligible sessions by where they read from.",
+            [["", {"target": target}, value] for target, value in replicas["reads"].items()],
+        ),
+        _value("db_replica_hit_ratio", "gauge", "Share of reads served by a replica.", replicas["hit_ratio"]),
+        _family(
+            "db_replica_lag_seconds",
+            "gauge",
+            "Replication lag per replica; -1 when unreachable.",
+            [
+                ["", {"replica": replica["name"]}, -1 if replica["lag_seconds"] is None else replica["lag_seconds"]]
+                for replica in replicas["replicas"]
+            ],
+        ),
+        _family(
+            "db_replica_healthy",
+            "gauge",
+            "Whether each replica is in rotation.",
+            [["", {"replica": replica["name"]}, int(replica["healthy"])] for replica in replicas["replicas"]],
+        ),
+        *_gauges(
+            "password_hash",
+            "bcrypt process pool",
+            {key: hasher[key] for key in ("workers", "pending", "max_pending", "utilization")},
+        ),
+        _value("password_hash_rejected_total", "counter", "Hashes rejected by a saturated pool.", hasher["rejected"]),
+        *_gauges("audit_queue", "Audit queue", {"depth": audit["queue_depth"], "capacity": audit["queue_capacity"]}),
+        _value("audit_events_written_total", "counter", "Events written by the audit writer.", audit["written"]),
+        _value("audit_flush_errors_total", "counter", "Failed audit writer flushes.", audit["flush_errors"]),
+        _value("audit_coalesced_events_total", "counter", "Events merged into a record.", coalescer["coalesced"]),
+        _value("audit_coalesced_records_total", "counter", "Coalesced records written.", coalescer["records"]),
+        _value("audit_coalesced_open", "gauge", "Coalesced records not yet written.", coalescer["open"]),
+        _value("auth_login_rate_limited_total", "counter", "Logins refused by the rate limiter.", limiter["rejected"]),
+        _value("auth_lockouts_total", "counter", "Login lockouts recorded.", limiter["lockouts"]),
+        _value("auth_revoked_tokens", "gauge", "Revoked access tokens held in memory.", revocations["entries"]),
+        _value("auth_revocation_poll_errors_total", "counter", "Failed revocation polls.", revocations["poll_errors"]),
+        _value("token_reaper_deleted_total", "counter", "Expired or revoked tokens deleted.", reaper["deleted"]),
+        _value("token_reaper_batches_total", "counter", "Token reaper delete batches.", reaper["batches"]),
+        _value("token_reaper_runs_total", "counter", "Token reaper runs.", reaper["runs"]),
+        _value("token_reaper_errors_total", "counter", "Failed token reaper runs.", reaper["errors"]),
+    ]
+
+
+def merge(processes: dict[str, list[dict]]) -> list[dict]:
+    """Combine per-process snapshots: counters and histograms are summed, gauges keep a ``pid`` label."""
+    merged: dict[str, dict] = {}
+    for process, families in processes.items():
+        pid = process.partition("-")[0]
+        for family in families:
+            target = merged.setdefault(family["name"], {**family, "samples": {}})
+            for suffix, labels, value in family["samples"]:
+                if family["type"] == "gauge" and len(processes) > 1:
+                    labels = {**labels, "pid": pid}
+                key = (suffix, tuple(sorted(labels.items())))
+                target["samples"][key] = target["samples"].get(key, 0) + value
+    return [
+        {**family, "samples": [[suffix, dict(labels), value] for (suffix, labels), value in family["samples"].items()]}
+        for family in merged.values()
+    ]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(families: list[dict]) -> str:
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family['name']} {family['help']}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            name = f"{family['name']}{suffix}{{{label_text}}}" if label_text else f"{family['name']}{suffix}"
+            lines.append(f"{name} {value}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+class MetricsSnapshotWriter:
+    """Shares this worker's metrics with its siblings through a directory of per-process snapshots.
+
+    Every worker writes ``collect()`` to ``<directory>/<pid>-<uuid>.json``
+    each ``interval`` seconds and on shutdown, so a reused pid never
+    overwrites a dead worker's file. Whichever worker serves /metrics merges
+    its live values with the other files. Gauges of a file older than three
+    intervals are dropped; once it is older than ``retire_intervals`` its
+    counters and histograms are folded into ``retired.json`` and the file
+    is deleted, so exited workers keep counting towards the totals.
+    """
+
+    def __init__(self, directory: str | None, *, interval: float, retire_intervals: int = 20) -> None:
+        self.directory = Path(directory) if directory else None
+        self.interval = interval
+        self.retire_intervals = retire_intervals
+        self.instance = _instance_name()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self.directory is None or self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.instance = _instance_name()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.write()
+
+    def write(self) -> None:
+        _write_json(self.directory / f"{self.instance}.json", collect())
+
+    def gather(self) -> list[dict]:
+        if self.directory is None:
+            return collect()
+        processes = {self.instance: collect()}
+        stale_before = time.time() - self.interval * 3
+        with self._directory_lock(fcntl.LOCK_SH):
+            for path in self.directory.glob("*.json"):
+                name = path.stem
+                if name == self.instance:
+                    continue
+                try:
+                    families = json.loads(path.read_text())
+                    stale = path.stat().st_mtime < stale_before
+                except (OSError, ValueError):
+                    continue
+                if stale:
+                    families = [family for family in families if family["type"] != "gauge"]
+                processes[name] = families
+        return merge(processes)
+
+    def retire(self) -> None:
+        """Fold the counters and histograms of snapshots older than ``retire_intervals`` into ``retired.json``."""
+        retire_before = time.time() - self.interval * self.retire_intervals
+        retired_path = self.directory / f"{RETIRED}.json"
+        with self._directory_lock(fcntl.LOCK_EX):
+            processes = {}
+            expired = []
+            for path in self.directory.glob("*.json"):
+                if path.stem in (self.instance, RETIRED):
+                    continue
+                try:
+                    if path.stat().st_mtime >= retire_before:
+                        continue
+                    families = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                processes[path.stem] = [family for family in families if family["type"] != "gauge"]
+                expired.append(path)
+            if not expired:
+                return
+            if retired_path.exists():
+                processes[RETIRED] = json.loads(retired_path.read_text())
+            _write_json(retired_path, merge(processes))
+            for path in expired:
+                path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _directory_lock(self, mode: int) -> Iterator[None]:
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, mode)
+            yield
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+                self.retire()
+            except Exception:
+                logger.exception("Writing metrics snapshot failed")
+
+
+def _instance_name() -> str:
+    return f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+
+def _write_json(path: Path, value) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(value))
+    os.replace(tmp, path)
+
+
+metrics_snapshots = MetricsSnapshotWriter(
+    settings.metrics_multiproc_dir,
+    interval=settings.metrics_snapshot_interval_seconds,
+)
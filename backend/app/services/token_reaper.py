@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import LatencyStats
+from app.db.session import SystemSessionLocal
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class TokenReaper:
+    """Deletes expired refresh tokens, tokens revoked longer than ``revoked_grace`` ago and expired revocations.
+
+    Rows are removed in batches of ``batch_size``, each in its own short
+    transaction, so no single delete holds locks on a large range of the table.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        batch_size: int,
+        revoked_grace: timedelta,
+        batch_pause: float = 0.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.revoked_grace = revoked_grace
+        self.batch_pause = batch_pause
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._run_duration = LatencyStats()
+        self._stats = {"runs": 0, "batches": 0, "deleted": 0, "last_run_deleted": 0, "errors": 0}
+
+    def reap(self, *, max_batches: int | None = None, on_batch: Callable[[int, int], None] | None = None) -> int:
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        revoked_before = now - self.revoked_grace
+        targets = (
+            (RefreshToken, or_(RefreshToken.expires_at < now, RefreshToken.revoked_at < revoked_before)),
+            (RevokedToken, RevokedToken.expires_at < now),
+        )
+        total = batches = 0
+        for model, condition in targets:
+            while max_batches is None or batches < max_batches:
+                if self._stop.is_set():
+                    break
+                with self.session_factory() as db:
+                    ids = db.scalars(
+                        select(model.id).where(condition).limit(self.batch_size).with_for_update(skip_locked=True)
+                    ).all()
+                    if not ids:
+                        break
+                    db.execute(delete(model).where(model.id.in_(ids)))
+                    db.commit()
+                total += len(ids)
+                batches += 1
+                with self._lock:
+                    self._stats["batches"] += 1
+                    self._stats["deleted"] += len(ids)
+                if on_batch is not None:
+                    on_batch(batches, total)
+                if len(ids) < self.batch_size:
+                    break
+                if self.batch_pause:
+                    time.sleep(self.batch_pause)
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["last_run_deleted"] = total
+        self._run_duration.observe((time.perf_counter() - started) * 1000)
+        return total
+
+    def start(self, interval: float) -> None:
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="token-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["run_duration"] = self._run_duration.snapshot()
+        return stats
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                deleted = self.reap()
+            except Exception:
+                with self._lock:
+                    self._stats["errors"] += 1
+                logger.exception("Refresh token reaper run failed")
+                continue
+            if deleted:
+                logger.info("Reaped %d expired or revoked tokens", deleted)
+
+
+token_reaper = TokenReaper(
+    SystemSessionLocal,
+    batch_size=settings.token_reaper_batch_size,
+    revoked_grace=timedelta(hours=settings.token_revoked_grace_hours),
+    batch_pause=settings.token_reaper_batch_pause_ms / 1000,
+)
@@ -0,0 +1,211 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+import multiprocessing
+import secrets
+from typing import Callable, Iterable, Iterator
+
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.agency import Agency
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.services.audit import add_event
+from app.services.password_hashing import hash_password
+
+_email = TypeAdapter(EmailStr)
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    invites: list[dict] = field(default_factory=list)
+
+    def fail(self, line: int, email: str | None, error: str) -> None:
+        self.failed += 1
+        self.errors.append({"line": line, "email": email, "error": error})
+
+
+@dataclass
+class _Candidate:
+    line: int
+    email: str
+    secret: str
+    invited: bool
+    role_ids: list[int]
+    is_active: bool
+    hashed_password: str = ""
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _parse_bool(value: str | None) -> bool:
+    return (value or "true").strip().lower() not in ("0", "false", "no", "n")
+
+
+def _validate(
+    chunk: list[tuple[int, dict]],
+    db: Session,
+    role_ids: dict[str, int],
+    seen: set[str],
+    report: ImportReport,
+) -> list[_Candidate]:
+    candidates = []
+    for line, row in chunk:
+        raw_email = (row.get("email") or "").strip()
+        try:
+            email = _email.validate_python(raw_email).lower()
+        except ValidationError:
+            report.fail(line, raw_email or None, "Invalid email")
+            continue
+        if email in seen:
+            report.fail(line, email, "Duplicate email in file")
+            continue
+        names = [name.strip() for name in (row.get("roles") or "").split(";") if name.strip()]
+        unknown = [name for name in names if name not in role_ids]
+        if unknown:
+            report.fail(line, email, f"Unknown role: {', '.join(unknown)}")
+            continue
+        seen.add(email)
+        password = row.get("password") or ""
+        candidates.append(
+            _Candidate(
+                line=line,
+                email=email,
+                secret=password or secrets.token_urlsafe(24),
+                invited=not password,
+                role_ids=[role_ids[name] for name in names],
+                is_active=_parse_bool(row.get("is_active")),
+            )
+        )
+
+    existing = set(db.scalars(select(User.email).where(User.email.in_([c.email for c in candidates]))))
+    accepted = []
+    for candidate in candidates:
+        if candidate.email in existing:
+            report.fail(candidate.line, candidate.email, "Email already registered")
+        else:
+            accepted.append(candidate)
+    return accepted
+
+
+def _insert(db: Session, agency_id: int, candidates: list[_Candidate]) -> list[_Candidate]:
+    ids = db.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [
+            {
+                "agency_id": agency_id,
+                "email": candidate.email,
+                "hashed_password": candidate.hashed_password,
+                "is_active": candidate.is_active,
+            }
+            for candidate in candidates
+        ],
+    ).scalars().all()
+    assignments = [
+        {"user_id": user_id, "role_id": role_id}
+        for user_id, candidate in zip(ids, candidates)
+        for role_id in candidate.role_ids
+    ]
+    if assignments:
+        db.execute(insert(UserRole), assignments)
+    return candidates
+
+
+def _insert_individually(db: Session, agency_id: int, candidates: list[_Candidate], report: ImportReport) -> list[_Candidate]:
+    inserted = []
+    for candidate in candidates:
+        try:
+            with db.begin_nested():
+                _insert(db, agency_id, [candidate])
+        except IntegrityError:
+            report.fail(candidate.line, candidate.email, "Email already registered")
+        else:
+            inserted.append(candidate)
+    return inserted
+
+
+def import_users(
+    session_factory: Callable[[], Session],
+    lines: Iterable[str],
+    *,
+    agency_id: int,
+    actor_user_id: int | None,
+    chunk_size: int = 500,
+    hash_workers: int = 0,
+    hash_many: Callable[[list[str]], list[str]] | None = None,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> ImportReport:
+    """Create users from CSV ``lines`` (email, password, roles, is_active) in batched transactions.
+
+    Rows are validated and inserted ``chunk_size`` at a time; a bad row is
+    reported and skipped without failing the rest. Rows without a password get
+    a random invite token, returned in the report. Passwords are hashed with
+    ``hash_many`` when given, otherwise across ``hash_workers`` processes of a
+    pool created for this call, and each committed chunk writes one audit event.
+    """
+    report = ImportReport()
+    seen: set[str] = set()
+    rows = enumerate(csv.DictReader(lines), start=2)
+    executor: Executor | None = None
+    if hash_many is None and hash_workers > 0:
+        executor = ProcessPoolExecutor(max_workers=hash_workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with session_factory() as db:
+            if db.get(Agency, agency_id) is None:
+                raise ValueError(f"Unknown agency: {agency_id}")
+            role_ids = {name: role_id for role_id, name in db.execute(select(Role.id, Role.name))}
+            for chunk in _chunks(rows, chunk_size):
+                candidates = _validate(chunk, db, role_ids, seen, report)
+                if not candidates:
+                    continue
+                secrets_ = [candidate.secret for candidate in candidates]
+                if hash_many is not None:
+                    hashes = hash_many(secrets_)
+                elif executor is not None:
+                    hashes = executor.map(hash_password, secrets_, chunksize=max(1, len(secrets_) // (hash_workers * 4)))
+                else:
+                    hashes = map(hash_password, secrets_)
+                for candidate, hashed in zip(candidates, hashes):
+                    candidate.hashed_password = hashed
+
+                try:
+                    inserted = _insert(db, agency_id, candidates)
+                except IntegrityError:
+                    db.rollback()
+                    inserted = _insert_individually(db, agency_id, candidates, report)
+                if inserted:
+                    add_event(
+                        db,
+                        agency_id=agency_id,
+                        actor_user_id=actor_user_id,
+                        event_type="users_imported",
+                        resource_type="user",
+                        message=f"Bulk imported {len(inserted)} users (lines {chunk[0][0]}-{chunk[-1][0]})",
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                    )
+                db.commit()
+                report.created += len(inserted)
+                report.invites.extend(
+                    {"email": candidate.email, "invite_token": candidate.secret}
+                    for candidate in inserted
+                    if candidate.invited
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    report.errors.sort(key=lambda error: error["line"])
+    return report
@@ -0,0 +1,39 @@
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import warm_async_pool, warm_pool
+from app.services.security import create_access_token, decode_token, password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+async def _timed(timings: dict[str, float], name: str, pending) -> None:
+    started = time.perf_counter()
+    await pending
+    timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _warm_jwt() -> None:
+    decode_token(create_access_token(subject="warm-up", expires_delta=timedelta(minutes=1)))
+
+
+async def _warm_database() -> None:
+    await run_in_threadpool(warm_pool, settings.db_pool_size)
+    await warm_async_pool(settings.db_pool_size)
+
+
+async def warm_up() -> dict[str, float]:
+    """Pay first-use costs during startup instead of on the first requests; returns milliseconds per step."""
+    timings: dict[str, float] = {}
+    await asyncio.gather(
+        _timed(timings, "password_hasher", password_hasher.warm()),
+        _timed(timings, "jwt", _warm_jwt()),
+        _timed(timings, "database", _warm_database()),
+    )
+    logger.info("Warm-up finished: %s", timings)
+    return timings
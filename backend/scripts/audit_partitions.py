@@ -0,0 +1,39 @@
+import argparse
+from datetime import datetime, timezone
+import sys
+
+from sqlalchemy.exc import DBAPIError
+
+from app.db.partitions import add_months, create_audit_partitions, detach_audit_partitions, month_start
+from app.db.session import engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain monthly audit_logs partitions (PostgreSQL only).")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    create = subcommands.add_parser("create", help="Create partitions for upcoming months")
+    create.add_argument("--months-ahead", type=int, default=3)
+    detach = subcommands.add_parser("detach", help="Detach partitions older than the retention window")
+    detach.add_argument("--retain-months", type=int, required=True)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        parser.exit(1, f"audit_logs is only partitioned on PostgreSQL, not {engine.dialect.name}\n")
+    current = month_start(datetime.now(timezone.utc).date())
+    try:
+        with engine.begin() as connection:
+            if args.command == "create":
+                names = create_audit_partitions(connection, current, args.months_ahead + 1)
+            else:
+                names = detach_audit_partitions(connection, add_months(current, -args.retain_months))
+    except DBAPIError as exc:
+        reason = str(exc.orig).strip().splitlines()[0] if exc.orig is not None else type(exc).__name__
+        print(f"Could not {args.command} audit partitions, no changes were made: {reason}", file=sys.stderr)
+        raise SystemExit(1)
+    if args.command == "create":
+        print(f"Ensured {len(names)} partitions: {', '.join(names)}")
+    else:
+        print(f"Detached {len(names)} partitions: {', '.join(names) or '-'}")
+
+if __name__ == "__main__":
+    main()
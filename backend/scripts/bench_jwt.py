@@ -0,0 +1,60 @@
+"""Compare access-token decode throughput across JWT backends, with and without the claims cache.
+
+    python -m scripts.bench_jwt --iterations 20000
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import time
+import uuid
+
+from app.services.jwt_backends import JWT_BACKENDS
+from app.services.security import TokenCache, jwt_keys
+
+
+def _payload() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "sub": "1",
+        "exp": now + timedelta(minutes=30),
+        "iat": now,
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+    }
+
+
+def _measure(decode, token: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode(token)
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, backend_class in JWT_BACKENDS.items():
+        try:
+            backend = backend_class(jwt_keys)
+        except (ImportError, ValueError):
+            print(f"{name:>6}: unavailable for {jwt_keys.algorithm}")
+            continue
+        token = backend.encode(_payload())
+        uncached = _measure(backend.decode, token, args.iterations)
+
+        cache = TokenCache(4096)
+
+        def cached_decode(token: str) -> dict:
+            claims = cache.get(token)
+            if claims is None:
+                claims = backend.decode(token)
+                cache.put(token, claims)
+            return claims
+
+        cached = _measure(cached_decode, token, args.iterations)
+        print(f"{name:>6}: {uncached:10.0f} decodes/s uncached  {cached:10.0f} decodes/s cached")
+
+
+if __name__ == "__main__":
+    main()
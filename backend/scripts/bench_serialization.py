@@ -0,0 +1,132 @@
+"""Compare per-row serialization cost of the list endpoints before and after trusted rendering.
+
+"before" is FastAPI's default path: ORM objects (or dicts) validated through
+the route's response model and rendered with the stdlib encoder. "after"
+builds dicts from projected rows and renders them with
+``TrustedJSONResponse``. Rows are fetched once from an in-memory SQLite
+database; only the serialization is timed, after checking both paths
+produce the same JSON.
+
+    python -m scripts.bench_serialization --rows 1000 --iterations 50
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+import time
+
+
+def _seed(db, rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db.base import Agency, AuditLog, Role, User
+
+    db.add(Agency(id=1, name="Bench Agency"))
+    db.flush()
+    now = datetime.now(timezone.utc)
+    db.execute(insert(Role), [{"name": f"role-{n}"} for n in range(min(rows, 50))])
+    db.execute(
+        insert(User),
+        [
+            {"agency_id": 1, "email": f"user{n}@bench.example.com", "hashed_password": "x", "is_active": True}
+            for n in range(rows)
+        ],
+    )
+    db.execute(
+        insert(AuditLog),
+        [
+            {
+                "agency_id": 1,
+                "actor_user_id": 1,
+                "event_type": "phi_access",
+                "resource_type": "user",
+                "resource_id": str(n),
+                "message": "Seeded benchmark event",
+                "ip_address": "10.0.0.1",
+                "user_agent": "bench",
+                "created_at": now - timedelta(seconds=n),
+            }
+            for n in range(rows)
+        ],
+    )
+    db.commit()
+
+
+def _time_per_row(render, rows: int, iterations: int) -> float:
+    render()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - started) / iterations / rows * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.api.audit import AUDIT_LOG_COLUMNS
+    from app.api.responses import TrustedJSONResponse, records
+    from app.db.base import AuditLog, Base, Role, User
+    from app.schemas.audit import AuditLogPage
+    from app.schemas.role import RoleRead
+    from app.schemas.user import UserPage
+
+    loop = asyncio.new_event_loop()
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _seed(db, args.rows)
+        user_columns = (User.id, User.agency_id, User.email, User.is_active)
+        cases = {
+            "users": (
+                UserPage,
+                {"items": records(db.execute(select(*user_columns)).all())},
+                db.execute(select(*user_columns)).all(),
+                lambda items: {"items": items, "next_cursor": None, "total": None},
+            ),
+            "roles": (
+                list[RoleRead],
+                db.scalars(select(Role)).all(),
+                db.execute(select(Role.id, Role.name)).all(),
+                lambda items: items,
+            ),
+            "audit": (
+                AuditLogPage,
+                {"items": db.scalars(select(AuditLog)).all()},
+                db.execute(select(*AUDIT_LOG_COLUMNS)).all(),
+                lambda items: {"items": items, "next_cursor": None},
+            ),
+        }
+
+        for name, (response_model, before_content, rows, page) in cases.items():
+            field = create_model_field(name=f"Response_{name}", type_=response_model, mode="serialization")
+
+            def before() -> bytes:
+                content = loop.run_until_complete(serialize_response(field=field, response_content=before_content))
+                return JSONResponse(content).body
+
+            def after() -> bytes:
+                return TrustedJSONResponse(page(records(rows))).body
+
+            before_body, after_body = before(), after()
+            if json.loads(before_body) != json.loads(after_body):
+                raise SystemExit(f"{name}: trusted rendering differs from the validated response")
+            count = len(rows)
+            before_us = _time_per_row(before, count, args.iterations)
+            after_us = _time_per_row(after, count, args.iterations)
+            print(
+                f"{name:>6}: {count:6d} rows  before {before_us:7.2f} us/row  "
+                f"after {after_us:6.2f} us/row  ({before_us / after_us:5.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
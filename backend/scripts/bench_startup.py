@@ -0,0 +1,166 @@
+"""Measure cold start: import time per module, app construction, startup and the first requests.
+
+Each run is a fresh interpreter started with ``-X importtime`` against the
+same seeded database, once with STARTUP_WARMUP off and once with it on, so
+the cost moved from the first login into startup is visible. Reports medians
+across ``--runs`` as JSON; import times are self times, grouped by top-level
+package and listed for the slowest modules. They cover importing the app
+and ``create_app``; the hash pool's worker processes are left out.
+
+    python -m scripts.bench_startup --runs 5 --top 25 --output startup.json
+"""
+import argparse
+from collections import defaultdict
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+STARTUP_MARKER = "bench_startup: lifespan starting"
+EMAIL = "bench-admin@example.com"
+PASSWORD = "BenchPassword123!"
+MODES = {"cold": "false", "warm": "true"}
+
+
+def _elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000
+
+
+async def _first_requests(app) -> dict:
+    import httpx
+
+    timings = {}
+    checkpoint = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = _elapsed_ms(checkpoint)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in ("first_login_ms", "second_login_ms"):
+                checkpoint = time.perf_counter()
+                response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                timings[name] = _elapsed_ms(checkpoint)
+                response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            for name in ("first_me_ms", "second_me_ms"):
+                checkpoint = time.perf_counter()
+                (await client.get("/users/me", headers=headers)).raise_for_status()
+                timings[name] = _elapsed_ms(checkpoint)
+    return timings
+
+
+def run_child() -> None:
+    import asyncio
+
+    checkpoint = time.perf_counter()
+    from app.main import create_app
+
+    timings = {"import_ms": _elapsed_ms(checkpoint)}
+    checkpoint = time.perf_counter()
+    app = create_app()
+    timings["create_app_ms"] = _elapsed_ms(checkpoint)
+    print(STARTUP_MARKER, file=sys.stderr, flush=True)
+    timings.update(asyncio.run(_first_requests(app)))
+    timings["ready_to_serve_ms"] = timings["import_ms"] + timings["create_app_ms"] + timings["startup_ms"]
+    print(json.dumps(timings))
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    modules = {}
+    for line in stderr.split(STARTUP_MARKER)[0].splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = modules.get(name.strip(), 0) + int(self_us)
+    return modules
+
+
+def run_mode(warmup: str, env: dict) -> tuple[dict, dict[str, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "scripts.bench_startup", "--child"],
+        env={**env, "STARTUP_WARMUP": warmup},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values), 1) if values else 0.0
+
+
+def summarize(runs: list[tuple[dict, dict[str, int]]], top: int) -> dict:
+    timings = {name: _median([run[name] for run, _ in runs]) for name in runs[0][0]}
+    modules: dict[str, list[int]] = defaultdict(list)
+    for _, imports in runs:
+        for name, self_us in imports.items():
+            modules[name].append(self_us)
+    self_ms = {name: statistics.median(values) / 1000 for name, values in modules.items()}
+    packages: dict[str, float] = defaultdict(float)
+    for name, value in self_ms.items():
+        packages[name.split(".")[0]] += value
+    return {
+        "timings": timings,
+        "import_total_ms": round(sum(self_ms.values()), 1),
+        "import_by_package_ms": {
+            name: round(value, 1) for name, value in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_modules_ms": {
+            name: round(value, 1) for name, value in sorted(self_ms.items(), key=lambda item: -item[1])[:top]
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20, help="Packages and modules to list")
+    parser.add_argument("--bcrypt-rounds", type=int, help="Override BCRYPT_ROUNDS for the run")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--output", help="Write the JSON report to this file as well as stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        env["SEED_ADMIN_EMAIL"] = EMAIL
+        env["SEED_ADMIN_PASSWORD"] = PASSWORD
+        if args.bcrypt_rounds:
+            env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from app.db.base import Base; from app.db.session import engine; from scripts import seed; "
+                "Base.metadata.create_all(engine); seed.main()",
+            ],
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+        results = {
+            mode: summarize([run_mode(warmup, env) for _ in range(args.runs)], args.top)
+            for mode, warmup in MODES.items()
+        }
+
+    report = {
+        "config": {"runs": args.runs, "bcrypt_rounds": args.bcrypt_rounds, "python": sys.version.split()[0]},
+        "modes": results,
+    }
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(body + "\n")
+    print(body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+from datetime import datetime
+import sys
+
+from app.db.session import SessionLocal
+from app.db.tenancy import agency_sessions
+from app.services.audit_export import ExportStats, iter_audit_export
+from app.services.audit_query import audit_filters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream an agency's audit log to a file in constant memory.")
+    parser.add_argument("--agency-id", type=int, required=True)
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Inclusive lower bound on created_at")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Exclusive upper bound on created_at")
+    parser.add_argument("--event-type")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--cursor", help="Resume cursor printed by an interrupted export")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--output", default="-", help="Output file, '-' for stdout; appended to when resuming")
+    args = parser.parse_args()
+
+    filters = audit_filters(args.agency_id, event_type=args.event_type, start=args.start, end=args.end)
+    stats = ExportStats()
+    chunks = iter_audit_export(
+        agency_sessions(SessionLocal, args.agency_id),
+        filters,
+        fmt=args.format,
+        compress=args.gzip,
+        cursor=args.cursor,
+        batch_size=args.batch_size,
+        stats=stats,
+    )
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "ab" if args.cursor else "wb")
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    except KeyboardInterrupt:
+        print(f"Interrupted; resume with --cursor {stats.resume_cursor}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        output.flush()
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    summary = stats.as_dict()
+    print(
+        f"Exported {summary['rows']} rows, {summary['bytes']} bytes in {summary['seconds']:.1f}s "
+        f"({summary['rows_per_second']:.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
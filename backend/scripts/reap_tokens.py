@@ -0,0 +1,23 @@
+import argparse
+
+from app.services.token_reaper import token_reaper
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired and long-revoked refresh tokens and expired revocations.")
+    parser.add_argument("--batch-size", type=int, default=token_reaper.batch_size)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    token_reaper.batch_size = args.batch_size
+
+    def report(batches: int, deleted: int) -> None:
+        print(f"batch {batches}: {deleted} tokens deleted")
+
+    deleted = token_reaper.reap(max_batches=args.max_batches, on_batch=report)
+    metrics = token_reaper.metrics()
+    print(f"Reaped {deleted} tokens in {metrics['run_duration']['total_ms']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
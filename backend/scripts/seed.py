@@ -2,11 +2,12 @@ import os
 
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.session import SystemSessionLocal
 from app.models.agency import Agency
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
+from app.services.authorization import ensure_default_permissions
 from app.services.security import get_password_hash
 
 
@@ -25,7 +26,7 @@ def main() -> None:
     admin_email = os.environ.get("SEED_ADMIN_EMAIL", "admin@acme.test")
     admin_password = os.environ.get("SEED_ADMIN_PASSWORD", "ChangeMe123!")
 
-    db = SessionLocal()
+    db = SystemSessionLocal()
     try:
         agency = db.query(Agency).filter(Agency.name == agency_name).first()
         if not agency:
@@ -36,6 +37,7 @@ def main() -> None:
 
         admin_role = get_or_create_role(db, "admin")
         get_or_create_role(db, "clinician")
+        ensure_default_permissions(db)
 
         user = db.query(User).filter(User.email == admin_email).first()
         if not user: